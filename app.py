@@ -1,13 +1,34 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import joblib
-import shap 
-import seaborn as sns 
-import matplotlib.pyplot as plt 
 import numpy as np 
+import hashlib
+import io
+import os
+import time
 from datetime import datetime 
+from dropout.scoring import (CLASS_MAPPING, DROPOUT_CLASS_CODE, DEFAULT_CHUNK_SIZE,
+                             MissingFeaturesError, NonNumericFeaturesError, normalize_column_names,
+                             add_derived_features, align_features, derived_frame, model_features,
+                             class_label, iter_batch_predictions, predict_with_proba, sniff_separator)
+from dropout.startup import IMPORT_TIMES, timed_import
+from dropout.registry import ModelRegistry
+from dropout.sharedmem import SHARED_DIR, attach_or_publish, frame_from_shared, publish_frame, shared_path
+from dropout.prediction_cache import PredictionCache
+from dropout.sensitivity import DEFAULT_SWEEP_FEATURES, default_sweep_values, sensitivity_curves
+from dropout.metrics import MetricsStore
+from dropout.streaming import StreamingDataset, should_stream
+from dropout.datastore import DATA_PATH, dataset_version, load_dataset
+from dropout.filters import FilterIndex
+from dropout.schema import memory_report
+from dropout.cube import IndexedSummary
+from dropout.violin import VIOLIN_LARGE_DATA_THRESHOLD, VIOLIN_SAMPLE_SIZE, build_large_violin_figure
+from dropout.violin import is_large as is_large_for_violin
+from dropout.correlation import correlation_source
+from dropout.cohort_shap import CohortShap, cohort_features, cohort_shap_path
+from dropout.drift import DriftMonitor, DriftReference, drift_alerts
+from dropout.table import PAGE_SIZE_OPTIONS, export_bytes, page_count, page_frame, sorted_positions
+# Library berat (plotly, seaborn, matplotlib, shap, joblib) dimuat malas lewat timed_import
+# hanya di halaman/expander yang membutuhkannya, agar cold start worker tetap ringan.
 
 # --- Konfigurasi Aplikasi ---
 st.set_page_config(layout="wide", page_title="Analisis Prediksi Dropout Mahasiswa")
@@ -22,73 +43,97 @@ if 'model_status' not in st.session_state:
     st.session_state.model_status = "Belum Dimuat"
 
 
-# --- Konfigurasi Path ---
-DATA_PATH = "data/data.csv"
-MODEL_PATH_JOBLIB = 'model/tuned_lightgbm_model.joblib'
-MODEL_PATH_PKL = 'model/tuned_lightgbm_model.pkl'
+# --- Instrumentasi performa (durasi tahap & hit/miss cache, dibagi antar sesi) ---
+@st.cache_resource
+def get_metrics_store():
+    return MetricsStore()
+
+perf_metrics = get_metrics_store()
+
+
+# --- Konfigurasi Prediksi Batch ---
+BATCH_CHUNK_SIZE = DEFAULT_CHUNK_SIZE # Jumlah baris per panggilan predict_proba pada mode batch
+
+# --- Prediksi batch: hasil di-cache per isi file & versi model, tidak diskor ulang di setiap rerun ---
+@st.cache_data(max_entries=4, show_spinner="Memproses prediksi batch...")
+def score_batch_file(file_bytes, model_version, _engine, _model):
+    """Parse, selaraskan dan skor file batch; mengembalikan (fitur lengkap, jumlah per label, CSV hasil)."""
+    perf_metrics.mark_cache_miss('batch_scoring')
+    first_line = file_bytes[:4096].decode('utf-8-sig', errors='ignore').splitlines()[0] if file_bytes else ''
+    batch_df = pd.read_csv(io.BytesIO(file_bytes), sep=sniff_separator(first_line), encoding='utf-8-sig')
+    input_columns = normalize_column_names(batch_df.columns)
+    batch_features = derived_frame(batch_df) # Fitur lengkap (termasuk turunan) untuk pemantauan drift
+    batch_input = model_features(batch_features, _model) # Penyelarasan & cek numerik sekali untuk seluruh file
+
+    result_buffer = io.StringIO()
+    predicted_label_counts = pd.Series(dtype=int)
+    for start, chunk_result in iter_batch_predictions(_engine, batch_input, chunk_size=BATCH_CHUNK_SIZE):
+        chunk_output = pd.concat([batch_features.loc[chunk_result.index, input_columns], chunk_result], axis=1)
+        chunk_output.to_csv(result_buffer, index=False, header=(start == 0))
+        predicted_label_counts = predicted_label_counts.add(chunk_result['prediksi_label'].value_counts(), fill_value=0)
+    return batch_features, predicted_label_counts.astype(int), result_buffer.getvalue().encode('utf-8')
+
+# --- Muat Model Machine Learning Anda (registry dengan hot-reload dari folder model/) ---
+@st.cache_resource
+def get_model_registry():
+    perf_metrics.mark_cache_miss('model_registry')
+    registry = ModelRegistry(shared_dir=SHARED_DIR) # DROPOUT_SHARED_DIR: array pohon dibagi antar proses lewat mmap
+    with perf_metrics.timer('model_load'):
+        registry.load()
+    return registry.start() # Thread pengawas: periksa versi artefak baru secara berkala
+
+model_registry = perf_metrics.cached_call('model_registry', get_model_registry)
+active_model = model_registry.active # Satu snapshot per rerun; penggantian versi tidak mengganggu rerun yang sedang berjalan
+if active_model is not None:
+    model, inference_engine = active_model.model, active_model.engine
+    st.session_state.model_load_time = active_model.loaded_at
+    st.session_state.model_status = "Berhasil Dimuat"
+else:
+    model, inference_engine = None, None
+    st.session_state.model_load_time = None
+    if isinstance(model_registry.last_error, FileNotFoundError):
+        st.session_state.model_status = "File Model Tidak Ditemukan"
+    else:
+        st.session_state.model_status = f"Error Pemuatan Model: {model_registry.last_error}"
+
+# --- Cache hasil prediksi & SHAP (dibagi antar sesi dalam satu proses) ---
+@st.cache_resource
+def get_prediction_cache():
+    perf_metrics.mark_cache_miss('prediction_cache')
+    return PredictionCache()
+
+prediction_cache = perf_metrics.cached_call('prediction_cache', get_prediction_cache)
 
-# --- Muat Model Machine Learning Anda ---
-@st.cache_resource 
-def load_model_with_timestamp():
-    model_obj = None
+# --- Monitor drift: sketsa distribusi data latih dibangun sekali, input diskor digabung secara inkremental ---
+@st.cache_resource
+def get_drift_monitor():
+    perf_metrics.mark_cache_miss('drift_monitor')
     try:
-        model_obj = joblib.load(MODEL_PATH_JOBLIB)
-        st.session_state.model_load_time = datetime.now()
-        st.session_state.model_status = "Berhasil Dimuat"
-        return model_obj
-    except FileNotFoundError:
-        try:
-            model_obj = joblib.load(MODEL_PATH_PKL)
-            st.session_state.model_load_time = datetime.now()
-            st.session_state.model_status = "Berhasil Dimuat"
-            return model_obj
-        except FileNotFoundError:
-            st.session_state.model_status = "File Model Tidak Ditemukan"
-            st.session_state.model_load_time = None
-            return None
-        except Exception as e:
-            st.session_state.model_status = f"Error Pemuatan Model (.pkl): {e}"
-            st.session_state.model_load_time = None
-            return None
-    except Exception as e:
-        st.session_state.model_status = f"Error Pemuatan Model (.joblib): {e}"
-        st.session_state.model_load_time = None
-        return None
+        return DriftMonitor(DriftReference.from_training())
+    except (OSError, KeyError, ValueError):
+        return None # X_train/data.csv tidak tersedia: prediksi tetap jalan tanpa monitor
 
-model = load_model_with_timestamp() # Panggil fungsi yang sudah dimodifikasi
+drift_monitor = perf_metrics.cached_call('drift_monitor', get_drift_monitor)
 
 if st.session_state.model_status == "Berhasil Dimuat":
     st.sidebar.success(f"Model: {st.session_state.model_status}")
+    if model_registry.last_error is not None:
+        st.sidebar.warning(f"Versi model baru gagal dimuat, versi aktif tetap dipakai: {model_registry.last_error}")
 else:
     st.sidebar.error(f"Model: {st.session_state.model_status}")
 
 
 # --- Fungsi untuk memuat dan membersihkan data (untuk visualisasi) ---
-@st.cache_data 
-def load_data_for_visualization_with_timestamp(data_path=DATA_PATH):
+# cache_resource: satu DataFrame dipakai bersama (read-only) tanpa unpickle salinan baru di setiap rerun
+@st.cache_resource
+def load_data_for_visualization_with_timestamp(data_path=DATA_PATH, data_version=None):
+    perf_metrics.mark_cache_miss('data_viz')
+    # data_version hanya dipakai sebagai kunci cache agar data baru otomatis dimuat ulang
     try:
-        df = pd.read_csv(data_path, sep=';')
+        df = load_dataset(data_path) # Parquet bertipe (memory-map), CSV hanya bila lebih baru
         st.session_state.data_viz_load_time = datetime.now() # Catat waktu pemuatan data
-        if 'Status' in df.columns:
-            df['Status'] = df['Status'].str.strip()
-        else:
+        if 'Status' not in df.columns:
             st.warning("Kolom 'Status' tidak ditemukan dalam dataset. Beberapa fitur visualisasi mungkin tidak berfungsi.")
-        
-        df.columns = df.columns.str.strip().str.replace(' ', '_').str.replace(r'[\(\)]', '', regex=True)
-        
-        potential_numeric_cols = [
-            'Previous_qualification_grade', 'Admission_grade',
-            'Curricular_units_1st_sem_grade', 'Curricular_units_2nd_sem_grade',
-            'Age_at_enrollment', 'Unemployment_rate', 'Inflation_rate', 'GDP',
-            'Curricular_units_1st_sem_credited', 'Curricular_units_1st_sem_enrolled',
-            'Curricular_units_1st_sem_evaluations', 'Curricular_units_1st_sem_approved',
-            'Curricular_units_2nd_sem_credited', 'Curricular_units_2nd_sem_enrolled',
-            'Curricular_units_2nd_sem_evaluations', 'Curricular_units_2nd_sem_approved',
-            'Application_order'
-        ]
-        for col in potential_numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
         return df
     except FileNotFoundError:
         st.session_state.data_viz_load_time = "File Data Tidak Ditemukan"
@@ -99,6 +144,77 @@ def load_data_for_visualization_with_timestamp(data_path=DATA_PATH):
         st.error(f"Error saat memuat data untuk visualisasi: {e}")
         return pd.DataFrame()
 
+# --- Mode out-of-core: agregat streaming + sampel reservoir (sekali pemindaian per versi data) ---
+@st.cache_resource
+def get_streaming_dataset(data_path, data_version):
+    perf_metrics.mark_cache_miss('streaming_scan')
+    dataset = StreamingDataset.scan(data_path)
+    st.session_state.data_viz_load_time = datetime.now()
+    return dataset
+
+# --- Mode memori bersama: kolom data bertipe diterbitkan sekali, proses lain attach tanpa salinan ---
+@st.cache_resource
+def get_shared_dataset(data_path, data_version):
+    perf_metrics.mark_cache_miss('shared_data')
+    shared = attach_or_publish(shared_path(SHARED_DIR, 'data', data_version),
+                               lambda shared_file: publish_frame(shared_file, load_dataset(data_path), data_version),
+                               data_version)
+    st.session_state.data_viz_load_time = datetime.now()
+    return frame_from_shared(shared)
+
+# --- Laporan memori rencana dtype (int8/int16, float32, categorical) ---
+@st.cache_resource
+def get_memory_report(_df, data_version, streaming_mode):
+    perf_metrics.mark_cache_miss('memory_report')
+    return memory_report(_df)
+
+# --- SHAP seluruh populasi: dihitung/dimuat sekali per versi model & data, tab hanya mengiris baris ---
+@st.cache_resource
+def get_cohort_features(_df, _model, data_version, model_version, streaming_mode):
+    perf_metrics.mark_cache_miss('cohort_features')
+    return cohort_features(_df, _model)
+
+@st.cache_resource
+def get_cohort_shap(_loaded_model, _features, model_version, cohort_data_version):
+    perf_metrics.mark_cache_miss('cohort_shap')
+
+    def build_explainer():
+        # Hanya jalur hitung: matriks yang sudah tersimpan dimuat tanpa mengimpor shap atau memuat model lengkap
+        timed_import('shap')
+        return _loaded_model.explainer()
+
+    return CohortShap.load_or_compute(build_explainer, _features, model_version, cohort_data_version,
+                                      DROPOUT_CLASS_CODE, model_path=_loaded_model.path)
+
+# --- Indeks filter sidebar (dibangun sekali per versi data) ---
+@st.cache_resource
+def get_filter_index(_df, data_version):
+    perf_metrics.mark_cache_miss('filter_index')
+    return FilterIndex(_df)
+
+# --- Ringkasan KPI & tab kategorikal: marginal per kolom + posisi indeks filter (dibangun sekali per versi data) ---
+@st.cache_resource
+def get_summary(_df, _filter_index, data_version):
+    perf_metrics.mark_cache_miss('summary')
+    return IndexedSummary(_df, _filter_index)
+
+# --- Sumber korelasi: co-moment per grup filter, atau corr() langsung bila grup terlalu rapat (sekali per versi data) ---
+@st.cache_resource
+def get_correlation_source(_df, _filter_index, data_version, key_columns):
+    perf_metrics.mark_cache_miss('correlation_source')
+    return correlation_source(_df, list(key_columns), _filter_index)
+
+@st.cache_data
+def correlation_for_filters(_correlation_source, data_version, filter_items):
+    perf_metrics.mark_cache_miss('correlation')
+    return _correlation_source.corr(dict(filter_items))
+
+# --- Urutan baris tabel data mentah (dihitung ulang hanya bila data/filter/urutan berubah) ---
+@st.cache_resource(max_entries=16)
+def get_sorted_positions(_df, data_version, filter_items, sort_col, ascending):
+    perf_metrics.mark_cache_miss('sorted_positions')
+    return sorted_positions(_df, sort_col, ascending)
+
 # --- Navigasi Aplikasi ---
 st.sidebar.title("Menu Navigasi")
 page_options = ["📊 Dashboard Analisis Data", "🤖 Prediksi Status Mahasiswa (ML)"]
@@ -110,71 +226,106 @@ st.sidebar.markdown("🎓 *Solusi Deteksi Dini Mahasiswa Dropout*")
 # --- Halaman Visualisasi Data ---
 if page == "📊 Dashboard Analisis Data":
     st.title("📊 Dashboard Analisis Data Mahasiswa")
+    px = timed_import('plotly.express')
     st.markdown("Eksplorasi data mahasiswa untuk mendapatkan wawasan terkait faktor-faktor yang mempengaruhi status kelulusan.")
 
     # Panggil fungsi pemuatan data yang mencatat timestamp
-    df_viz = load_data_for_visualization_with_timestamp() 
+    data_version = dataset_version(DATA_PATH)
+    streaming_mode = should_stream(DATA_PATH)
+    streaming_dataset = None
+    with perf_metrics.timer('data_load'):
+        if streaming_mode:
+            try:
+                streaming_dataset = perf_metrics.cached_call('streaming_scan', get_streaming_dataset, DATA_PATH, data_version)
+                df_viz = streaming_dataset.sample # Hanya sampel berukuran tetap yang ada di memori
+            except Exception as e:
+                st.session_state.data_viz_load_time = f"Error Pemuatan Data: {e}"
+                st.error(f"Error saat memindai data secara streaming: {e}")
+                df_viz = pd.DataFrame()
+        elif SHARED_DIR:
+            try:
+                df_viz = perf_metrics.cached_call('shared_data', get_shared_dataset, DATA_PATH, data_version)
+            except Exception as e:
+                st.session_state.data_viz_load_time = f"Error Pemuatan Data: {e}"
+                st.error(f"Error saat memuat data dari memori bersama: {e}")
+                df_viz = pd.DataFrame()
+        else:
+            df_viz = perf_metrics.cached_call('data_viz', load_data_for_visualization_with_timestamp, DATA_PATH, data_version)
 
     if not df_viz.empty and 'Status' in df_viz.columns:
         
         st.sidebar.header("Filter Data (Visualisasi)")
-        categorical_cols_for_filter = [col for col in df_viz.columns if df_viz[col].nunique() < 20 and df_viz[col].dtype == 'object' and col != 'Status']
+        st.sidebar.caption(perf_metrics.cached_call('memory_report', get_memory_report, df_viz, data_version, streaming_mode).summary())
+        if streaming_mode:
+            filter_index = streaming_dataset.filter_index # Opsi dari agregat seluruh data, irisan pada sampel
+            st.sidebar.caption(f"Mode out-of-core: {streaming_dataset.n_rows:,} baris diringkas secara streaming.")
+        else:
+            filter_index = perf_metrics.cached_call('filter_index', get_filter_index, df_viz, data_version)
+        categorical_cols_for_filter = list(filter_index.columns)
         
         filters = {}
         for col in categorical_cols_for_filter:
-            unique_options = df_viz[col].dropna().unique()
-            options = ['Semua'] + sorted(list(unique_options))
+            options = filter_index.options(col)
             filters[col] = st.sidebar.selectbox(f"Filter berdasarkan {col.replace('_', ' ').title()}:", options, index=0, key=f"filter_{col}")
 
-        df_filtered = df_viz.copy()
-        for col, val in filters.items():
-            if val != 'Semua':
-                df_filtered = df_filtered[df_filtered[col] == val]
+        with perf_metrics.timer('filtering'):
+            df_filtered = filter_index.apply(df_viz, filters) # Irisan indeks posisi, tanpa salinan penuh df_viz
+        with perf_metrics.timer('aggregate_build'):
+            if streaming_mode:
+                summary_cube, correlation = streaming_dataset.cube, streaming_dataset.correlation
+            else:
+                summary_cube = perf_metrics.cached_call('summary', get_summary, df_viz, filter_index, data_version)
+                correlation = perf_metrics.cached_call('correlation_source', get_correlation_source, df_viz, filter_index, data_version, tuple(categorical_cols_for_filter))
 
-        if df_filtered.empty:
+        kpi_start = time.perf_counter()
+        status_counts = summary_cube.status_counts(filters) # Dari ringkasan/kubus, bukan pemindaian DataFrame
+        total_students = int(status_counts.sum())
+        if total_students == 0:
             st.warning("Tidak ada data yang cocok dengan filter yang dipilih.")
         else:
             st.header("📈 Key Performance Indicators (KPIs)")
             col_kpi1, col_kpi2, col_kpi3 = st.columns(3)
             
-            total_students = len(df_filtered)
-            dropout_count = df_filtered[df_filtered['Status'] == 'Dropout'].shape[0]
+            dropout_count = int(status_counts.get('Dropout', 0))
             
             if total_students > 0:
                 dropout_rate = (dropout_count / total_students) * 100
                 col_kpi1.metric("Tingkat Dropout Keseluruhan", f"{dropout_rate:.2f}%", f"{dropout_count} dari {total_students} mahasiswa")
 
-                avg_admission_grade_dropout = df_filtered[df_filtered['Status'] == 'Dropout']['Admission_grade'].mean()
-                avg_admission_grade_graduate = df_filtered[df_filtered['Status'] == 'Graduate']['Admission_grade'].mean()
+                avg_admission_grade = summary_cube.mean_by_status('Admission_grade', filters)
+                avg_admission_grade_dropout = avg_admission_grade.get('Dropout', np.nan)
+                avg_admission_grade_graduate = avg_admission_grade.get('Graduate', np.nan)
                 
                 if pd.notna(avg_admission_grade_graduate):
                     col_kpi2.metric("Rata-rata Nilai Penerimaan (Lulus)", f"{avg_admission_grade_graduate:.2f}")
                 if pd.notna(avg_admission_grade_dropout):
                      col_kpi2.metric("Rata-rata Nilai Penerimaan (Dropout)", f"{avg_admission_grade_dropout:.2f}", delta=f"{avg_admission_grade_dropout - avg_admission_grade_graduate:.2f} vs Lulus" if pd.notna(avg_admission_grade_graduate) else None, delta_color="inverse")
 
-                avg_approved_1st_sem_graduate = df_filtered[df_filtered['Status'] == 'Graduate']['Curricular_units_1st_sem_approved'].mean()
-                avg_approved_1st_sem_dropout = df_filtered[df_filtered['Status'] == 'Dropout']['Curricular_units_1st_sem_approved'].mean()
+                avg_approved_1st_sem = summary_cube.mean_by_status('Curricular_units_1st_sem_approved', filters)
+                avg_approved_1st_sem_graduate = avg_approved_1st_sem.get('Graduate', np.nan)
+                avg_approved_1st_sem_dropout = avg_approved_1st_sem.get('Dropout', np.nan)
                 if pd.notna(avg_approved_1st_sem_graduate):
                     col_kpi3.metric("Rata-rata SKS Lulus Sem 1 (Lulus)", f"{avg_approved_1st_sem_graduate:.2f}")
                 if pd.notna(avg_approved_1st_sem_dropout):
                     col_kpi3.metric("Rata-rata SKS Lulus Sem 1 (Dropout)", f"{avg_approved_1st_sem_dropout:.2f}", delta_color="inverse")
             else:
                 st.info("Tidak ada data untuk menampilkan KPI setelah filter diterapkan.")
+            perf_metrics.record('kpi', time.perf_counter() - kpi_start)
 
             st.markdown("---")
 
-            tab1, tab2, tab3, tab4, tab5 = st.tabs([
+            tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
                 "📊 Distribusi Status", 
                 "🎻 Distribusi Fitur Numerik", 
                 "🧮 Analisis Fitur Kategorikal", 
                 "🔗 Korelasi Fitur",
-                "📄 Data Mentah Terfilter"
+                "📄 Data Mentah Terfilter",
+                "🧠 Penjelasan Global (SHAP)"
             ])
 
-            with tab1:
+            with tab1, perf_metrics.timer('tab1_distribusi_status'):
                 st.subheader("Distribusi Status Mahasiswa")
-                if not df_filtered['Status'].empty:
-                    status_counts = df_filtered['Status'].value_counts()
+                if not status_counts.empty:
                     fig_status_pie = px.pie(status_counts, values=status_counts.values, names=status_counts.index,
                                             title='Proporsi Status Mahasiswa', hole=.3,
                                             color_discrete_sequence=px.colors.qualitative.Pastel)
@@ -183,14 +334,22 @@ if page == "📊 Dashboard Analisis Data":
                 else:
                     st.info("Tidak ada data status untuk ditampilkan.")
 
-            with tab2:
+            with tab2, perf_metrics.timer('tab2_violin'):
                 st.subheader("Distribusi Fitur Numerik Utama berdasarkan Status")
+                if streaming_mode:
+                    st.caption(f"Mode out-of-core: grafik memakai sampel acak {len(df_filtered):,} baris (dari {total_students:,} baris yang cocok dengan filter).")
                 numeric_cols_for_violin = ['Admission_grade', 'Previous_qualification_grade', 'Age_at_enrollment', 'Curricular_units_1st_sem_grade', 'Curricular_units_1st_sem_approved', 'Curricular_units_2nd_sem_grade', 'Curricular_units_2nd_sem_approved']
                 valid_numeric_cols_violin = [col for col in numeric_cols_for_violin if col in df_filtered.columns and df_filtered[col].nunique() > 1]
 
                 if valid_numeric_cols_violin:
                     selected_violin_col = st.selectbox("Pilih Fitur Numerik untuk Violin Plot:", valid_numeric_cols_violin, key="violin_select")
-                    if selected_violin_col:
+                    if selected_violin_col and is_large_for_violin(df_filtered):
+                        st.caption(f"Mode data besar aktif ({len(df_filtered):,} baris > {VIOLIN_LARGE_DATA_THRESHOLD:,}): densitas dihitung di server, titik ditampilkan sebagai sampel {VIOLIN_SAMPLE_SIZE:,} baris terstratifikasi per Status.")
+                        fig_violin = build_large_violin_figure(df_filtered, selected_violin_col, 'Status',
+                                                               colors=px.colors.qualitative.Pastel,
+                                                               title=f"Distribusi {selected_violin_col.replace('_',' ').title()} berdasarkan Status")
+                        st.plotly_chart(fig_violin, use_container_width=True)
+                    elif selected_violin_col:
                         fig_violin = px.violin(df_filtered, y=selected_violin_col, x='Status', color='Status',
                                                box=True, points="all", hover_data=df_filtered.columns,
                                                title=f"Distribusi {selected_violin_col.replace('_',' ').title()} berdasarkan Status",
@@ -200,20 +359,20 @@ if page == "📊 Dashboard Analisis Data":
                 else:
                     st.info("Tidak ada fitur numerik yang valid untuk ditampilkan dalam violin plot.")
 
-            with tab3:
+            with tab3, perf_metrics.timer('tab3_kategorikal'):
                 st.subheader("Analisis Fitur Kategorikal terhadap Status")
-                candidate_cat_cols = [col for col in df_filtered.columns if df_filtered[col].dtype == 'object' and df_filtered[col].nunique() < 15 and col != 'Status']
+                candidate_cat_cols = [col for col in summary_cube.key_columns if len(summary_cube.distinct_values(col, filters)) < 15]
                 if candidate_cat_cols:
                     selected_cat_col_analysis = st.selectbox("Pilih Fitur Kategorikal untuk Analisis:", candidate_cat_cols, key="cat_analysis_select")
                     if selected_cat_col_analysis:
-                        grouped_bar_data = df_filtered.groupby([selected_cat_col_analysis, 'Status']).size().reset_index(name='Jumlah')
+                        grouped_bar_data = summary_cube.group_status_counts(selected_cat_col_analysis, filters)
                         fig_cat_bar = px.bar(grouped_bar_data, x=selected_cat_col_analysis, y='Jumlah', color='Status',
                                              barmode='group', title=f"Jumlah Mahasiswa berdasarkan {selected_cat_col_analysis.replace('_',' ').title()} dan Status",
                                              color_discrete_sequence=px.colors.qualitative.Pastel)
                         fig_cat_bar.update_layout(legend_title_text='Status')
                         st.plotly_chart(fig_cat_bar, use_container_width=True)
 
-                        df_percentage = df_filtered.groupby(selected_cat_col_analysis)['Status'].value_counts(normalize=True).mul(100).rename('Persentase').reset_index()
+                        df_percentage = summary_cube.group_status_percentages(selected_cat_col_analysis, filters)
                         fig_cat_stacked_bar = px.bar(df_percentage, x=selected_cat_col_analysis, y='Persentase', color='Status',
                                              title=f"Persentase Status Mahasiswa berdasarkan {selected_cat_col_analysis.replace('_',' ').title()}",
                                              color_discrete_sequence=px.colors.qualitative.Pastel)
@@ -223,25 +382,123 @@ if page == "📊 Dashboard Analisis Data":
                 else:
                     st.info("Tidak ada fitur kategorikal yang cocok untuk analisis mendalam saat ini.")
 
-            with tab4:
+            with tab4, perf_metrics.timer('tab4_korelasi'):
                 st.subheader("Heatmap Korelasi Antar Fitur Numerik")
-                numeric_df = df_filtered.select_dtypes(include=np.number) 
-                if not numeric_df.empty and numeric_df.shape[1] > 1:
-                    corr_matrix = numeric_df.corr()
-                    fig_heatmap, ax = plt.subplots(figsize=(12, 10))
-                    sns.heatmap(corr_matrix, annot=True, fmt=".2f", cmap="coolwarm", ax=ax, linewidths=.5, annot_kws={"size":8})
-                    ax.set_title("Matriks Korelasi Fitur Numerik", fontsize=16)
-                    plt.xticks(rotation=45, ha='right', fontsize=10)
-                    plt.yticks(rotation=0, fontsize=10)
-                    plt.tight_layout()
-                    st.pyplot(fig_heatmap)
+                numeric_columns = correlation.columns
+                if total_students > 0 and len(numeric_columns) > 1:
+                    corr_matrix = perf_metrics.cached_call('correlation', correlation_for_filters, correlation, data_version, tuple(sorted(filters.items())))
+                    if streaming_mode and filter_index.positions(filters) is not None:
+                        st.caption(f"Mode out-of-core: korelasi terfilter dihitung dari sampel acak {len(df_filtered):,} baris; tanpa filter dari seluruh data.")
+                    heatmap_renderer = st.radio("Renderer Heatmap:", ["Plotly (interaktif)", "Seaborn (statis)"], horizontal=True, key="heatmap_renderer")
+                    if heatmap_renderer == "Plotly (interaktif)":
+                        fig_heatmap = px.imshow(corr_matrix, text_auto=".2f", color_continuous_scale="RdBu_r", zmin=-1, zmax=1,
+                                                aspect="auto", title="Matriks Korelasi Fitur Numerik")
+                        fig_heatmap.update_layout(height=800, xaxis_tickangle=-45)
+                        st.plotly_chart(fig_heatmap, use_container_width=True)
+                    else:
+                        sns = timed_import('seaborn')
+                        plt = timed_import('matplotlib.pyplot')
+                        fig_heatmap, ax = plt.subplots(figsize=(12, 10))
+                        sns.heatmap(corr_matrix, annot=True, fmt=".2f", cmap="coolwarm", ax=ax, linewidths=.5, annot_kws={"size":8})
+                        ax.set_title("Matriks Korelasi Fitur Numerik", fontsize=16)
+                        plt.xticks(rotation=45, ha='right', fontsize=10)
+                        plt.yticks(rotation=0, fontsize=10)
+                        plt.tight_layout()
+                        st.pyplot(fig_heatmap)
+                        plt.close(fig_heatmap)
                 else:
                     st.info("Tidak cukup fitur numerik untuk membuat heatmap korelasi.")
 
-            with tab5:
+            with tab5, perf_metrics.timer('tab5_data_mentah'):
                 st.subheader("Tabel Data Mahasiswa (Terfilter)")
-                st.markdown("Anda dapat mengurutkan tabel dengan mengklik header kolom.")
-                st.dataframe(df_filtered, use_container_width=True, height=500)
+                st.markdown("Pengurutan dan pemilihan kolom dilakukan di server; hanya halaman yang sedang dilihat yang dikirim ke browser.")
+                if streaming_mode:
+                    st.caption(f"Mode out-of-core: tabel dan ekspor berisi sampel acak {len(df_filtered):,} dari {total_students:,} baris yang cocok dengan filter.")
+                all_table_columns = list(df_filtered.columns)
+                selected_table_columns = st.multiselect("Kolom yang Ditampilkan:", all_table_columns, default=all_table_columns, key="table_columns")
+                col_table_1, col_table_2, col_table_3, col_table_4 = st.columns(4)
+                with col_table_1:
+                    table_sort_col = st.selectbox("Urutkan berdasarkan:", ["(Urutan asli)"] + all_table_columns, key="table_sort_col")
+                with col_table_2:
+                    table_sort_ascending = st.selectbox("Arah Urutan:", ["Naik", "Turun"], key="table_sort_dir") == "Naik"
+                with col_table_3:
+                    table_page_size = st.selectbox("Baris per Halaman:", PAGE_SIZE_OPTIONS, index=1, key="table_page_size")
+                total_pages = page_count(len(df_filtered), table_page_size)
+                with col_table_4:
+                    table_page = st.number_input("Halaman:", min_value=1, max_value=total_pages, value=1, step=1, key="table_page")
+
+                table_positions = perf_metrics.cached_call('sorted_positions', get_sorted_positions, df_filtered, data_version, tuple(sorted(filters.items())),
+                                                       None if table_sort_col == "(Urutan asli)" else table_sort_col, table_sort_ascending)
+                table_page = min(table_page, total_pages)
+                st.dataframe(page_frame(df_filtered, table_positions, table_page, table_page_size, selected_table_columns),
+                             use_container_width=True, height=500)
+                first_row = (table_page - 1) * table_page_size + 1
+                st.caption(f"Menampilkan baris {first_row:,}–{min(table_page * table_page_size, len(df_filtered)):,} dari {len(df_filtered):,} (halaman {table_page} dari {total_pages}).")
+
+                export_format = st.radio("Format Ekspor:", ["CSV", "Parquet"], horizontal=True, key="table_export_format")
+                if st.button("Siapkan File Ekspor (seluruh data terfilter)", key="table_export_prepare"):
+                    st.download_button(f"⬇️ Unduh Data Terfilter ({export_format})",
+                                       data=export_bytes(df_filtered, export_format.lower(), table_positions, selected_table_columns),
+                                       file_name=f"data_terfilter.{export_format.lower()}",
+                                       mime="text/csv" if export_format == "CSV" else "application/octet-stream",
+                                       key="table_export_download")
+
+
+            with tab6, perf_metrics.timer('tab6_shap_global'):
+                st.subheader("Penjelasan Global Model (SHAP Seluruh Populasi)")
+                cohort_shap = None
+                if active_model is None or not active_model.explainable:
+                    st.info("Model aktif tidak tersedia atau tidak didukung SHAP TreeExplainer.")
+                else:
+                    cohort_data_version = f"{data_version}:sampel" if streaming_mode else data_version
+                    try:
+                        cohort_feature_df = perf_metrics.cached_call('cohort_features', get_cohort_features, df_viz, model, data_version, active_model.version, streaming_mode)
+                    except (MissingFeaturesError, KeyError, ValueError, TypeError) as e:
+                        st.info(f"Data visualisasi tidak dapat diubah menjadi fitur model, penjelasan global tidak tersedia: {e}")
+                    else:
+                        # Permintaan hanya berlaku untuk versi model & data saat tombol ditekan; versi baru menunggu tombol lagi
+                        cohort_shap_versions = (active_model.version, cohort_data_version)
+                        if st.button("Hitung Matriks SHAP Kohort", key="cohort_shap_compute"):
+                            st.session_state.cohort_shap_requested_for = cohort_shap_versions
+                        if (os.path.exists(cohort_shap_path(active_model.version, cohort_data_version, DROPOUT_CLASS_CODE))
+                                or st.session_state.get('cohort_shap_requested_for') == cohort_shap_versions):
+                            with st.spinner("Memuat matriks SHAP seluruh populasi..."):
+                                cohort_shap = perf_metrics.cached_call('cohort_shap', get_cohort_shap, active_model, cohort_feature_df,
+                                                                       active_model.version, cohort_data_version)
+                        else:
+                            st.info("Matriks SHAP untuk versi model & data ini belum tersedia. Hitung sekali dengan tombol di atas, atau siapkan saat deploy dengan `python -m dropout.cohort_shap`.")
+
+                if cohort_shap is not None:
+                    cohort_positions = filter_index.positions(filters) # None = seluruh baris
+                    cohort_rows = len(cohort_shap.values) if cohort_positions is None else len(cohort_positions)
+                    st.caption(f"Kontribusi terhadap kelas '{class_label(DROPOUT_CLASS_CODE)}' untuk {cohort_rows:,} baris "
+                               f"(nilai dasar {cohort_shap.base_value:.3f}). Matriks dihitung sekali per versi model & data; filter hanya mengiris barisnya.")
+                    if cohort_rows == 0:
+                        st.info("Tidak ada baris yang cocok dengan filter untuk penjelasan global.")
+                    else:
+                        shap_importance = cohort_shap.global_importance(cohort_positions)
+                        fig_importance = px.bar(shap_importance.sort_values().reset_index(), x='Rata-rata |SHAP|', y='Fitur', orientation='h',
+                                                title="Pentingnya Fitur Global (rata-rata |SHAP|)", color_discrete_sequence=px.colors.qualitative.Pastel)
+                        fig_importance.update_layout(height=500)
+                        st.plotly_chart(fig_importance, use_container_width=True)
+
+                        segment_contributions = pd.DataFrame({
+                            'Segmen terfilter': cohort_shap.mean_contributions(cohort_positions),
+                            'Seluruh populasi': cohort_shap.mean_contributions(),
+                        }).loc[shap_importance.index[::-1]]
+                        fig_segment = px.bar(segment_contributions.reset_index().melt(id_vars='Fitur', var_name='Kelompok', value_name='Rata-rata SHAP'),
+                                             x='Rata-rata SHAP', y='Fitur', color='Kelompok', barmode='group', orientation='h',
+                                             title="Rata-rata Kontribusi per Fitur: Segmen Filter vs Seluruh Populasi",
+                                             color_discrete_sequence=px.colors.qualitative.Pastel)
+                        fig_segment.update_layout(height=600)
+                        st.plotly_chart(fig_segment, use_container_width=True)
+
+                        dependence_feature = st.selectbox("Fitur untuk Dependence Plot:", list(shap_importance.index), key="shap_dependence_feature")
+                        dependence_df = cohort_shap.dependence_frame(cohort_feature_df, dependence_feature, cohort_positions, df_viz['Status'])
+                        fig_dependence = px.scatter(dependence_df, x=dependence_feature, y='SHAP', color='Status', opacity=0.6, render_mode='webgl',
+                                                    title=f"Dependence Plot: {dependence_feature.replace('_', ' ').title()}",
+                                                    color_discrete_sequence=px.colors.qualitative.Pastel)
+                        st.plotly_chart(fig_dependence, use_container_width=True)
 
     elif df_viz.empty:
         st.error("Gagal memuat data. Silakan periksa path dan file dataset Anda.")
@@ -254,6 +511,7 @@ if page == "📊 Dashboard Analisis Data":
 # --- Halaman Prediksi ML ---
 elif page == "🤖 Prediksi Status Mahasiswa (ML)":
     st.title("🤖 Prediksi Status Kelulusan Mahasiswa")
+    px = timed_import('plotly.express')
 
     if model is None:
         st.error("Model machine learning tidak berhasil dimuat. Fitur prediksi tidak tersedia.")
@@ -264,6 +522,43 @@ elif page == "🤖 Prediksi Status Mahasiswa (ML)":
         Nama kolom di DataFrame yang dikirim ke model harus sama persis dengan yang digunakan saat training.
         """)
 
+        with st.expander("📂 Prediksi Batch Kohort (Unggah CSV)", expanded=False):
+            st.markdown("Unggah file CSV berisi data banyak mahasiswa (pemisah `;` atau `,`, nama kolom seperti `data/data.csv`). Fitur turunan dihitung otomatis dan hasilnya dapat diunduh.")
+            batch_file = st.file_uploader("Pilih file CSV", type=["csv"], key="batch_csv_upload")
+            if batch_file is not None:
+                try:
+                    batch_features, predicted_label_counts, batch_result_csv = perf_metrics.cached_call(
+                        'batch_scoring', score_batch_file, batch_file.getvalue(), active_model.version, inference_engine, model)
+                except MissingFeaturesError as e:
+                    st.error(f"Fitur berikut diharapkan oleh model tetapi TIDAK ADA di file batch: {e.missing}")
+                except NonNumericFeaturesError as e:
+                    st.error(f"Kolom berikut harus berisi kode numerik (seperti data latih), bukan teks: {e.columns}")
+                except KeyError as e:
+                    st.error(f"Kolom wajib tidak ditemukan di file batch: {e}")
+                except Exception as e:
+                    st.error(f"Gagal membaca file batch: {e}")
+                else:
+                    if not hasattr(model, 'feature_names_in_'):
+                        st.warning("Atribut `model.feature_names_in_` tidak ditemukan. Menggunakan semua kolom file batch.")
+                    if drift_monitor is not None:
+                        # Satu file diamati sekali per sesi; rerun memakai laporan yang sama agar sketsa kumulatif tidak terhitung ganda
+                        batch_digest = hashlib.sha256(batch_file.getvalue()).hexdigest()
+                        if st.session_state.get('batch_drift_digest') != batch_digest:
+                            st.session_state.batch_drift_report = drift_monitor.observe(batch_features)
+                            st.session_state.batch_drift_digest = batch_digest
+                        batch_drift = st.session_state.batch_drift_report
+                        batch_drift_alerts = drift_alerts(batch_drift)
+                        if batch_drift_alerts:
+                            st.warning("Distribusi file batch berbeda dari data latih:\n\n" + "\n".join(f"- {alert}" for alert in batch_drift_alerts))
+                        st.markdown("**🛰️ Drift & Kualitas Data Batch**")
+                        st.dataframe(batch_drift.round(3), use_container_width=True)
+
+                    if len(batch_features):
+                        st.success(f"Prediksi selesai untuk {len(batch_features)} mahasiswa.")
+                        st.dataframe(predicted_label_counts.rename('Jumlah').to_frame())
+                        st.download_button("⬇️ Unduh Hasil Prediksi (CSV)", data=batch_result_csv,
+                                           file_name="hasil_prediksi_batch.csv", mime="text/csv", key="batch_download")
+
         with st.form("student_input_form_final_v5"): 
             st.header("Form Input Data Mahasiswa")
             
@@ -332,23 +627,13 @@ elif page == "🤖 Prediksi Status Mahasiswa (ML)":
                 gdp_val = st.number_input("GDP", value=0.0, key="gdp_final_v5", step=0.01)
 
 
+            with st.expander("Pengaturan Analisis Sensitivitas"):
+                sweep_features = st.multiselect("Fitur yang disapu", list(DEFAULT_SWEEP_FEATURES), default=list(DEFAULT_SWEEP_FEATURES), key="sweep_features")
+                sweep_points = st.slider("Jumlah titik per fitur", min_value=10, max_value=200, value=50, step=10, key="sweep_points")
+
             submit_button = st.form_submit_button(label="🚀 Prediksi Status & Analisis")
 
         if submit_button:
-            pass_ratio_sem1_val = (cu1_approved / cu1_enrolled) if cu1_enrolled > 0 else 0.0
-            pass_ratio_sem2_val = (cu2_approved / cu2_enrolled) if cu2_enrolled > 0 else 0.0
-            total_enrolled_val = float(cu1_enrolled + cu2_enrolled) 
-            
-            grades_sum = 0.0
-            semesters_with_grades = 0
-            if cu1_enrolled > 0 and cu1_grade is not None:
-                grades_sum += float(cu1_grade)
-                semesters_with_grades += 1
-            if cu2_enrolled > 0 and cu2_grade is not None:
-                grades_sum += float(cu2_grade)
-                semesters_with_grades += 1
-            average_grade_val = (grades_sum / semesters_with_grades) if semesters_with_grades > 0 else 0.0
-
             input_data_dict_temp = {
                 'Marital_status': ms_key, 'Application_mode': app_mode, 'Application_order': ap_order,
                 'Course': course, 'Daytime_evening_attendance': dt_attendance_key,
@@ -370,31 +655,19 @@ elif page == "🤖 Prediksi Status Mahasiswa (ML)":
                 'Curricular_units_2nd_sem_evaluations': cu2_evals,
                 'Curricular_units_2nd_sem_approved': cu2_approved,
                 'Curricular_units_2nd_sem_grade': cu2_grade,
-                'pass_ratio_sem1': pass_ratio_sem1_val,
-                'pass_ratio_sem2': pass_ratio_sem2_val,
-                'total_enrolled': total_enrolled_val,
-                'average_grade': average_grade_val,
                 'Unemployment_rate': unemployment_rate_val,
                 'Inflation_rate': inflation_rate_val,
                 'GDP': gdp_val
             }
             
             input_data_dict = {k: [v] for k, v in input_data_dict_temp.items()}
-            input_df_all_features = pd.DataFrame(input_data_dict)
+            input_df_all_features = add_derived_features(pd.DataFrame(input_data_dict))
             
-            expected_features = None
             if hasattr(model, 'feature_names_in_'):
-                expected_features = model.feature_names_in_
-                missing_from_form = set(expected_features) - set(input_df_all_features.columns)
-                if missing_from_form:
-                    st.error(f"ERROR KRITIS: Fitur berikut diharapkan oleh model tetapi TIDAK ADA di form/data input: {missing_from_form}. Harap perbarui form di app.py.")
-                    st.stop()
                 try:
-                    input_df = input_df_all_features[expected_features]
-                except KeyError as e:
-                    st.error(f"KeyError saat mencocokkan fitur: {e}. Fitur yang hilang: {set(expected_features) - set(input_df_all_features.columns)}")
-                    st.error(f"Fitur yang tersedia: {input_df_all_features.columns.tolist()}")
-                    st.error(f"Fitur yang diharapkan model: {list(expected_features)}")
+                    input_df = align_features(input_df_all_features, model)
+                except MissingFeaturesError as e:
+                    st.error(f"ERROR KRITIS: Fitur berikut diharapkan oleh model tetapi TIDAK ADA di form/data input: {e.missing}. Harap perbarui form di app.py.")
                     st.stop()
             else:
                 st.warning("Atribut `model.feature_names_in_` tidak ditemukan. Menggunakan semua input dari form. Pastikan ini sesuai dengan training model.")
@@ -403,17 +676,28 @@ elif page == "🤖 Prediksi Status Mahasiswa (ML)":
             st.markdown("---")
             st.subheader("📊 Data Input Mahasiswa (Dikirim ke Model):")
             st.dataframe(input_df)
+            if drift_monitor is not None:
+                input_drift_alerts = drift_alerts(drift_monitor.observe(input_df_all_features), include_missing=False) # Form tidak memuat semua kolom data latih
+                if input_drift_alerts:
+                    st.warning("Input tidak biasa dibanding data latih (prediksi mungkin kurang andal):\n\n" + "\n".join(f"- {alert}" for alert in input_drift_alerts))
 
             try:
-                prediction = model.predict(input_df)
-                proba = model.predict_proba(input_df)
+                prediction_cache_key = PredictionCache.key_for(input_df, active_model.version)
+                cached_prediction = prediction_cache.get(prediction_cache_key)
+                if cached_prediction is not None:
+                    prediction, proba = cached_prediction['prediction'], cached_prediction['proba']
+                else:
+                    with perf_metrics.timer('prediction'):
+                        prediction, proba = predict_with_proba(inference_engine, input_df) # Satu traversal pohon
+                    prediction_cache.put(prediction_cache_key, prediction=prediction, proba=proba)
+                    cached_prediction = {}
                 
                 predicted_status_val = prediction[0] 
                 
                 st.subheader("🎯 Hasil Prediksi Utama:")
                 
-                class_mapping = {0: 'Graduate/Enrolled', 1: 'Dropout'} 
-                dropout_class_code = 1 
+                class_mapping = CLASS_MAPPING
+                dropout_class_code = DROPOUT_CLASS_CODE
 
                 predicted_label = class_mapping.get(predicted_status_val, f"Kelas {predicted_status_val} (Tidak Terdefinisi)")
                 probability_of_predicted_label = proba[0][predicted_status_val] if proba.shape[1] > predicted_status_val else -1.0
@@ -438,112 +722,91 @@ elif page == "🤖 Prediksi Status Mahasiswa (ML)":
                          st.metric(label="Probabilitas Menjadi 'Dropout'", value=f"{probability_dropout*100:.2f}%",
                                    help="Ini adalah probabilitas mahasiswa diklasifikasikan sebagai 'Dropout'.")
 
+                with st.expander("📈 Analisis Sensitivitas (What-if)", expanded=False):
+                    st.markdown("Bagaimana probabilitas Dropout berubah bila satu fitur divariasikan dan fitur lain tetap? Seluruh grid diskor dalam satu panggilan model.")
+                    sweep_values = default_sweep_values(input_df_all_features.iloc[0], sweep_points, sweep_features)
+                    if not sweep_values:
+                        st.info("Pilih minimal satu fitur sapuan di Pengaturan Analisis Sensitivitas.")
+                    else:
+                        sensitivity_df = sensitivity_curves(inference_engine, input_df_all_features, sweep_values, dropout_class_code)
+                        sweep_columns = st.columns(len(sweep_values))
+                        for sweep_column, (sweep_feature, sweep_group) in zip(sweep_columns, sensitivity_df.groupby('Fitur', sort=False)):
+                            fig_sweep = px.line(sweep_group, x='Nilai', y='Probabilitas', markers=len(sweep_group) <= 25,
+                                                title=sweep_feature.replace('_', ' ').title())
+                            fig_sweep.add_vline(x=float(input_df_all_features.iloc[0][sweep_feature]), line_dash="dash", line_color="gray")
+                            fig_sweep.update_layout(yaxis_tickformat=".0%", yaxis_range=[0, 1], height=320, margin=dict(t=50, b=10))
+                            with sweep_column:
+                                st.plotly_chart(fig_sweep, use_container_width=True)
+                        st.caption("Garis putus-putus menandai nilai input saat ini.")
+
                 with st.expander("🔍 Lihat Penjelasan Detail Prediksi (SHAP Values)", expanded=False):
                     st.markdown("SHAP membantu memahami kontribusi setiap fitur terhadap prediksi.")
                     try:
-                        if "LGBMClassifier" in str(type(model)) or "XGBClassifier" in str(type(model)) or "RandomForestClassifier" in str(type(model)) :
-                            explainer = shap.TreeExplainer(model)
-                            shap_values_from_explainer = explainer.shap_values(input_df) 
-                            
-                            shap_values_for_class_plot = None 
-                            base_value_for_class_plot = None  
-
-                            if isinstance(shap_values_from_explainer, list) and len(shap_values_from_explainer) >= (dropout_class_code + 1):
-                                shap_values_for_class_plot = shap_values_from_explainer[dropout_class_code]
-                                if isinstance(explainer.expected_value, (list, np.ndarray)) and len(explainer.expected_value) > dropout_class_code:
-                                    base_value_for_class_plot = explainer.expected_value[dropout_class_code]
-                                elif not isinstance(explainer.expected_value, (list, np.ndarray)): 
-                                    base_value_for_class_plot = explainer.expected_value
-                                else: 
-                                     base_value_for_class_plot = explainer.expected_value[0] if hasattr(explainer.expected_value, '__len__') and len(explainer.expected_value)>0 else 0.0
-                                st.info(f"SHAP (dari list): Menampilkan SHAP values untuk kelas target '{class_mapping.get(dropout_class_code)}' (indeks {dropout_class_code}).")
-                            
-                            elif isinstance(shap_values_from_explainer, np.ndarray):
-                                if shap_values_from_explainer.ndim == 2 : 
-                                    shap_values_for_class_plot = shap_values_from_explainer
-                                    base_value_for_class_plot = explainer.expected_value 
-                                    if isinstance(base_value_for_class_plot, (list, np.ndarray)):
-                                        base_value_for_class_plot = base_value_for_class_plot[0] if hasattr(base_value_for_class_plot, '__len__') and len(base_value_for_class_plot)>0 else 0.0
-                                    st.info("SHAP (dari array 2D): Diasumsikan SHAP values untuk kelas positif (Dropout).")
-                                
-                                elif shap_values_from_explainer.ndim == 3: 
-                                    st.info(f"SHAP (dari array 3D): Bentuk terdeteksi: {shap_values_from_explainer.shape}.")
-                                    if shap_values_from_explainer.shape[0] == 1 and shap_values_from_explainer.shape[2] > dropout_class_code:
-                                        shap_values_for_class_plot = shap_values_from_explainer[0, :, dropout_class_code] 
-                                        
-                                        if isinstance(explainer.expected_value, (list, np.ndarray)) and len(explainer.expected_value) > dropout_class_code:
-                                            base_value_for_class_plot = explainer.expected_value[dropout_class_code]
-                                        elif not isinstance(explainer.expected_value, (list, np.ndarray)): 
-                                            base_value_for_class_plot = explainer.expected_value
-                                        else: 
-                                            base_value_for_class_plot = explainer.expected_value[0] if hasattr(explainer.expected_value, '__len__') and len(explainer.expected_value)>0 else 0.0
-                                            st.warning("Panjang expected_value tidak cukup untuk dropout_class_code, menggunakan elemen pertama.")
-                                        st.info(f"SHAP (dari array 3D): Dipilih SHAP values untuk kelas '{class_mapping.get(dropout_class_code)}' (indeks {dropout_class_code}).")
-                                    else:
-                                        st.warning(f"Bentuk array SHAP 3D ({shap_values_from_explainer.shape}) atau indeks kelas target ({dropout_class_code}) tidak sesuai.")
-                                else:
-                                     st.warning(f"Struktur SHAP values (ndarray) tidak terduga: Dimensi {shap_values_from_explainer.ndim}")
+                        if active_model.explainable:
+                            shap = timed_import('shap')
+                            plt = timed_import('matplotlib.pyplot')
+                            if 'shap_values' in cached_prediction:
+                                current_shap_instance_values = cached_prediction['shap_values']
+                                base_value_scalar = cached_prediction['base_value']
+                                shap_class_exact = cached_prediction['shap_class_exact']
                             else:
-                                st.warning(f"Struktur SHAP values tidak terduga: Tipe {type(shap_values_from_explainer)}")
-
-
-                            if shap_values_for_class_plot is not None and base_value_for_class_plot is not None:
-                                current_shap_instance_values = shap_values_for_class_plot[0] if shap_values_for_class_plot.ndim == 2 else shap_values_for_class_plot
-
-                                if hasattr(current_shap_instance_values, 'shape') and len(current_shap_instance_values.shape) == 1 and len(input_df.columns) == len(current_shap_instance_values):
-                                    base_value_scalar = base_value_for_class_plot
-                                    if isinstance(base_value_for_class_plot, (list, np.ndarray)):
-                                        base_value_scalar = base_value_for_class_plot[0] if hasattr(base_value_for_class_plot, '__len__') and len(base_value_for_class_plot) > 0 else 0.0
-                                    
-                                    st.subheader("Kontribusi Fitur Individual (Waterfall Plot)")
-                                    plt.clf() 
-                                    fig_waterfall, ax_waterfall_placeholder = plt.subplots(figsize=(10, 8)) 
-                                    shap.waterfall_plot(shap.Explanation(values=current_shap_instance_values, 
-                                                                          base_values=base_value_scalar, 
-                                                                          data=input_df.iloc[0].values, 
-                                                                          feature_names=input_df.columns),
-                                                        show=False, max_display=15)
-                                    # fig_waterfall.tight_layout() # Bisa dipanggil di sini
-                                    st.pyplot(fig_waterfall) 
-                                    plt.close(fig_waterfall) 
-
-                                    st.subheader("Dorongan Fitur (Force Plot)")
-                                    try:
-                                        plt.clf() 
-                                        fig_force, ax_force_placeholder = plt.subplots(figsize=(12, 3)) # Beri ruang lebih untuk label
-                                        shap.force_plot(base_value_scalar,
-                                                      current_shap_instance_values,
-                                                      input_df.iloc[0],
-                                                      matplotlib=True, 
-                                                      show=False, 
-                                                      # ax=ax_force_placeholder, # Dihapus
-                                                      link="logit",
-                                                      text_rotation=15 # Coba tambahkan rotasi teks jika label tumpang tindih
-                                                     )
-                                        fig_force.tight_layout(pad=0.1) # Sesuaikan padding
-                                        st.pyplot(fig_force)
-                                        plt.close(fig_force)
-                                    except Exception as e_force_plot:
-                                        st.error(f"Error saat membuat SHAP Force Plot (matplotlib): {e_force_plot}")
-                                        st.markdown("Mencoba fallback ke force plot HTML (mungkin memerlukan interaksi browser).")
-                                        try: 
-                                            shap.initjs()
-                                            force_plot_obj = shap.force_plot(base_value_scalar,
-                                                                              current_shap_instance_values,
-                                                                              input_df.iloc[0],
-                                                                              link="logit")
-                                            st.components.v1.html(force_plot_obj.html(), height=150, scrolling=True)
-                                        except Exception as e_html_force:
-                                            st.error(f"Gagal juga membuat force plot HTML: {e_html_force}")
-
-                                else:
-                                    st.error(f"Dimensi SHAP values ({current_shap_instance_values.shape if hasattr(current_shap_instance_values, 'shape') else 'N/A'}) atau jumlah fitur tidak cocok untuk waterfall plot.")
-                                    st.write("current_shap_instance_values:", current_shap_instance_values)
-                                    st.write("base_value_for_class_plot:", base_value_for_class_plot)
+                                with perf_metrics.timer('shap'):
+                                    model_explainer = active_model.explainer() # Versi hasil hot-reload sudah dipanaskan oleh registry
+                                    current_shap_instance_values = model_explainer.explain_class(input_df, dropout_class_code)[0]
+                                base_value_scalar = model_explainer.base_value(dropout_class_code)
+                                shap_class_exact = model_explainer.class_index(dropout_class_code) == dropout_class_code
+                                prediction_cache.update(prediction_cache_key, shap_values=current_shap_instance_values,
+                                                        base_value=base_value_scalar, shap_class_exact=shap_class_exact)
+                            if shap_class_exact:
+                                st.info(f"SHAP: Menampilkan SHAP values untuk kelas target '{class_mapping.get(dropout_class_code)}' (indeks {dropout_class_code}).")
                             else:
-                                st.error("Tidak dapat menentukan SHAP values atau base value yang sesuai untuk plot setelah memproses struktur output explainer.")
+                                st.info("SHAP (satu output): Diasumsikan SHAP values untuk kelas positif (Dropout).")
+
+                            shap_render_start = time.perf_counter()
+                            st.subheader("Kontribusi Fitur Individual (Waterfall Plot)")
+                            plt.clf() 
+                            fig_waterfall, ax_waterfall_placeholder = plt.subplots(figsize=(10, 8)) 
+                            shap.waterfall_plot(shap.Explanation(values=current_shap_instance_values, 
+                                                                  base_values=base_value_scalar, 
+                                                                  data=input_df.iloc[0].values, 
+                                                                  feature_names=input_df.columns),
+                                                show=False, max_display=15)
+                            # fig_waterfall.tight_layout() # Bisa dipanggil di sini
+                            st.pyplot(fig_waterfall) 
+                            plt.close(fig_waterfall) 
+
+                            st.subheader("Dorongan Fitur (Force Plot)")
+                            try:
+                                plt.clf() 
+                                fig_force, ax_force_placeholder = plt.subplots(figsize=(12, 3)) # Beri ruang lebih untuk label
+                                shap.force_plot(base_value_scalar,
+                                              current_shap_instance_values,
+                                              input_df.iloc[0],
+                                              matplotlib=True, 
+                                              show=False, 
+                                              # ax=ax_force_placeholder, # Dihapus
+                                              link="logit",
+                                              text_rotation=15 # Coba tambahkan rotasi teks jika label tumpang tindih
+                                             )
+                                fig_force.tight_layout(pad=0.1) # Sesuaikan padding
+                                st.pyplot(fig_force)
+                                plt.close(fig_force)
+                            except Exception as e_force_plot:
+                                st.error(f"Error saat membuat SHAP Force Plot (matplotlib): {e_force_plot}")
+                                st.markdown("Mencoba fallback ke force plot HTML (mungkin memerlukan interaksi browser).")
+                                try: 
+                                    shap.initjs()
+                                    force_plot_obj = shap.force_plot(base_value_scalar,
+                                                                      current_shap_instance_values,
+                                                                      input_df.iloc[0],
+                                                                      link="logit")
+                                    st.components.v1.html(force_plot_obj.html(), height=150, scrolling=True)
+                                except Exception as e_html_force:
+                                    st.error(f"Gagal juga membuat force plot HTML: {e_html_force}")
+                            perf_metrics.record('shap_render', time.perf_counter() - shap_render_start)
+
                         else:
-                            st.info(f"Tipe model saat ini ({type(model)}) mungkin tidak secara langsung didukung oleh SHAP TreeExplainer. Penjelasan SHAP mungkin terbatas.")
+                            st.info(f"Tipe model saat ini ({active_model.model_type}) mungkin tidak secara langsung didukung oleh SHAP TreeExplainer. Penjelasan SHAP mungkin terbatas.")
                     
                     except ImportError:
                         st.error("Library SHAP belum terinstal. Silakan instal dengan `pip install shap` untuk melihat penjelasan ini.")
@@ -560,9 +823,37 @@ st.sidebar.markdown("---")
 model_load_time_str = st.session_state.model_load_time.strftime("%Y-%m-%d %H:%M:%S") if isinstance(st.session_state.model_load_time, datetime) else "N/A"
 data_viz_load_time_str = st.session_state.data_viz_load_time.strftime("%Y-%m-%d %H:%M:%S") if isinstance(st.session_state.data_viz_load_time, datetime) else "N/A"
 
+prediction_cache_stats = prediction_cache.stats()
+
 st.sidebar.caption(f"""
 Versi Aplikasi: {APP_VERSION}<br>
+Cache Prediksi: {prediction_cache_stats['hits']} hit / {prediction_cache_stats['misses']} miss ({prediction_cache_stats['size']} entri)<br>
 Status Model: {st.session_state.model_status}<br>
+Model Aktif: {f"{active_model.version} (pemanasan {active_model.warmup_seconds:.3f} s)" if active_model is not None else "N/A"}<br>
 Model Dimuat: {model_load_time_str}<br>
 Data Visualisasi Dimuat: {data_viz_load_time_str}
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+if IMPORT_TIMES:
+    with st.sidebar.expander("⏱️ Biaya Impor Modul (proses ini)"):
+        for module_name, import_seconds in sorted(IMPORT_TIMES.items(), key=lambda item: -item[1]):
+            st.caption(f"{module_name}: {import_seconds:.3f} s")
+
+if drift_monitor is not None and drift_monitor.batches:
+    with st.sidebar.expander("🛰️ Monitor Drift (kumulatif)"):
+        cumulative_drift = drift_monitor.cumulative_report()
+        st.caption(f"{drift_monitor.n_observed:,} baris dari {drift_monitor.batches} batch/isian dibandingkan dengan data latih.")
+        for alert in drift_alerts(cumulative_drift):
+            st.warning(alert)
+        st.dataframe(cumulative_drift[['PSI', 'KS', 'Status']].round(3), use_container_width=True)
+
+if st.sidebar.checkbox("Tampilkan Panel Performa", value=False, key="show_perf_panel"):
+    with st.sidebar.expander("⚙️ Panel Performa", expanded=True):
+        stage_summary = perf_metrics.stage_summary()
+        if stage_summary:
+            st.dataframe(pd.DataFrame(stage_summary).round({'p50_ms': 2, 'p95_ms': 2}), hide_index=True, use_container_width=True)
+        cache_summary = perf_metrics.cache_summary()
+        if cache_summary:
+            st.dataframe(pd.DataFrame(cache_summary), hide_index=True, use_container_width=True)
+        st.download_button("⬇️ Metrik (format Prometheus)", data=perf_metrics.prometheus_text(),
+                           file_name="dropout_metrics.prom", mime="text/plain", key="perf_metrics_download")
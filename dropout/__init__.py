@@ -0,0 +1 @@
+"""Modul inti aplikasi prediksi dropout yang dapat dipakai tanpa Streamlit."""
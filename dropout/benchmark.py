@@ -0,0 +1,191 @@
+"""Benchmark jalur load, predict, explain dan agregasi dashboard, dengan output JSON.
+
+Dijalankan pada `data/data.csv` dan pada data sintetis yang diskalakan (bootstrap baris dari
+distribusi kolom yang ada, dengan jitter untuk kolom nilai kontinu)::
+
+    python -m dropout.benchmark --sizes base 100000 1000000 -o bench.json
+
+Setiap hasil berisi persentil latensi (ms), throughput (baris/detik) dan puncak memori Python
+(tracemalloc, MB) sehingga regresi antar versi dapat dibandingkan.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from dropout.datastore import DATA_PATH, load_dataset, read_csv_dataset
+from dropout.scoring import load_model, prepare_features
+
+CONTINUOUS_COLUMNS = ['Previous_qualification_grade', 'Admission_grade', 'Curricular_units_1st_sem_grade',
+                      'Curricular_units_2nd_sem_grade']
+# Kolom kode berkardinalitas rendah yang diperlakukan sebagai filter sidebar pada benchmark
+BENCHMARK_FILTER_COLUMNS = ['Course', 'Gender', 'Scholarship_holder']
+
+
+def synthesize(df, n_rows, seed=42):
+    """Data sintetis n_rows baris: bootstrap baris (menjaga korelasi) + jitter pada kolom nilai kontinu."""
+    rng = np.random.default_rng(seed)
+    synthetic = df.iloc[rng.integers(0, len(df), n_rows)].reset_index(drop=True)
+    for col in CONTINUOUS_COLUMNS:
+        if col in synthetic.columns:
+            values = synthetic[col].to_numpy(dtype=np.float64)
+            noise = rng.normal(0.0, 0.05 * np.nanstd(values), n_rows)
+            synthetic[col] = np.clip(values + np.where(values > 0, noise, 0.0), np.nanmin(values), np.nanmax(values))
+    return synthetic
+
+
+def measure(fn, repeat=5, warmup=1):
+    """Jalankan fn berulang; kembalikan latensi (detik) tiap ulangan dan puncak memori satu run terpisah."""
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return latencies, peak
+
+
+def summarize(name, dataset, n_rows, latencies, peak_bytes, rows_per_call):
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        'benchmark': name, 'dataset': dataset, 'rows': n_rows, 'repeat': len(latencies),
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(latencies_ms, 95)), 3),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 3),
+        'mean_ms': round(float(latencies_ms.mean()), 3),
+        'throughput_rows_s': round(rows_per_call / (latencies_ms.mean() / 1000), 1) if latencies_ms.mean() > 0 else None,
+        'peak_mem_mb': round(peak_bytes / 1e6, 3),
+    }
+
+
+def run_dataset(name, df, csv_path, model, engine, repeat=5, explain_rows=10_000):
+    from dropout.correlation import GroupedCoMoments, correlation_source
+    from dropout.cube import IndexedSummary, SummaryCube
+    from dropout.filters import FilterIndex
+
+    results = []
+    n_rows = len(df)
+
+    def add(bench_name, fn, rows_per_call, bench_repeat=repeat):
+        latencies, peak = measure(fn, repeat=bench_repeat)
+        results.append(summarize(bench_name, name, n_rows, latencies, peak, rows_per_call))
+        print(f"  {bench_name:<32} p50 {results[-1]['p50_ms']:>10.3f} ms", file=sys.stderr)
+
+    # --- Load ---
+    add('load_csv_parse', lambda: read_csv_dataset(csv_path), n_rows, bench_repeat=max(1, repeat // 2))
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    load_dataset(csv_path, parquet_path) # pastikan Parquet segar
+    add('load_parquet_mmap', lambda: load_dataset(csv_path, parquet_path), n_rows)
+
+    # --- Predict ---
+    features = prepare_features(df.drop(columns=['Status'], errors='ignore'), model)
+    single = features.iloc[:1]
+    add('predict_proba_single_sklearn', lambda: model.predict_proba(single), 1, bench_repeat=repeat * 20)
+    add('predict_proba_single_native', lambda: engine.predict_proba(single), 1, bench_repeat=repeat * 20)
+    add('predict_proba_batch_sklearn', lambda: model.predict_proba(features), n_rows)
+    add('predict_proba_batch_native', lambda: engine.predict_proba(features), n_rows)
+
+    # --- Explain ---
+    try:
+        from dropout.explain import ModelExplainer
+        explainer = ModelExplainer(model)
+        explain_batch = features.iloc[:explain_rows]
+        add('shap_explainer_build', lambda: ModelExplainer(model), 0, bench_repeat=max(1, repeat // 2))
+        add('shap_single', lambda: explainer.explain(single), 1)
+        add('shap_batch', lambda: explainer.explain(explain_batch), len(explain_batch), bench_repeat=max(1, repeat // 2))
+    except ImportError:
+        print("  shap tidak terinstal; benchmark explain dilewati", file=sys.stderr)
+
+    # --- Agregasi dashboard ---
+    dash_df = df.copy()
+    for col in BENCHMARK_FILTER_COLUMNS:
+        dash_df[col] = dash_df[col].astype('category')
+    first_values = {col: dash_df[col].cat.categories[0] for col in BENCHMARK_FILTER_COLUMNS[:2]}
+    filter_index = FilterIndex(dash_df)
+    cube = SummaryCube.from_frame(dash_df, list(filter_index.columns))
+    comoments = GroupedCoMoments(dash_df, list(filter_index.columns))
+    summary = IndexedSummary(dash_df, filter_index)
+
+    add('filter_index_build', lambda: FilterIndex(dash_df), n_rows)
+    add('filter_apply_index', lambda: filter_index.apply(dash_df, first_values), n_rows)
+    add('filter_apply_masks_baseline', lambda: dash_df[np.logical_and.reduce([dash_df[c] == v for c, v in first_values.items()])], n_rows)
+    add('cube_build', lambda: SummaryCube.from_frame(dash_df, list(filter_index.columns)), n_rows)
+    add('kpi_from_cube', lambda: (cube.status_counts(first_values), cube.mean_by_status('Admission_grade', first_values)), n_rows)
+    add('summary_build', lambda: IndexedSummary(dash_df, filter_index), n_rows)
+    add('kpi_from_summary', lambda: (summary.status_counts(first_values), summary.mean_by_status('Admission_grade', first_values)), n_rows)
+    add('kpi_masks_baseline', lambda: [dash_df[dash_df['Status'] == s]['Admission_grade'].mean() for s in ('Dropout', 'Graduate')], n_rows)
+    add('groupby_from_cube', lambda: cube.group_status_percentages('Course', first_values), n_rows)
+    add('groupby_from_summary', lambda: summary.group_status_percentages('Course', first_values), n_rows)
+    add('groupby_baseline', lambda: dash_df.groupby('Course', observed=True)['Status'].value_counts(normalize=True), n_rows)
+    add('corr_comoments_build', lambda: GroupedCoMoments(dash_df, list(filter_index.columns)), n_rows)
+    add('corr_from_comoments', lambda: comoments.corr(first_values), n_rows)
+    correlation = correlation_source(dash_df, list(filter_index.columns), filter_index)
+    add('corr_source_build', lambda: correlation_source(dash_df, list(filter_index.columns), filter_index), n_rows)
+    add('corr_from_source', lambda: correlation.corr(first_values), n_rows)
+    add('corr_pandas_baseline', lambda: dash_df.select_dtypes(include=np.number).corr(), n_rows)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark load/predict/explain/agregasi dashboard (output JSON).")
+    parser.add_argument('--sizes', nargs='+', default=['base', '100000'],
+                        help="'base' untuk data/data.csv, atau jumlah baris data sintetis (mis. 100000 1000000)")
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--model', help="Path model (default model/tuned_lightgbm_model.joblib)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--explain-rows', type=int, default=10_000, help="Jumlah baris untuk benchmark SHAP batch")
+    parser.add_argument('-o', '--output', default='-', help="File JSON hasil (default stdout)")
+    args = parser.parse_args(argv)
+
+    from dropout.fastpredict import build_inference_engine
+    model = load_model(args.model)
+    engine = build_inference_engine(model)
+    base_df = read_csv_dataset(args.data)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            if size == 'base':
+                df, name = base_df, 'base'
+                csv_path = os.path.join(tmp_dir, 'base.csv')
+                df.to_csv(csv_path, sep=';', index=False)
+            else:
+                n_rows = int(size)
+                df, name = synthesize(base_df, n_rows), f'synthetic_{n_rows}'
+                csv_path = os.path.join(tmp_dir, f'{name}.csv')
+                df.to_csv(csv_path, sep=';', index=False)
+            print(f"[{name}] {len(df)} baris", file=sys.stderr)
+            results.extend(run_dataset(name, df, csv_path, model, engine, args.repeat, args.explain_rows))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'pandas': pd.__version__, 'numpy': np.__version__, 'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""Matriks SHAP seluruh populasi untuk tab penjelasan global dashboard.
+
+SHAP dihitung sekali per versi model dan versi data (TreeExplainer paralel per potongan baris
+di pool proses), lalu disimpan ke disk sebagai `.npy` + metadata JSON. Dashboard hanya memuat
+matriks tersebut (memory-map) dan mengirisnya dengan posisi baris filter sidebar; penjelasan
+tidak pernah dihitung ulang secara interaktif. Matriks dapat disiapkan saat deploy::
+
+    python -m dropout.cohort_shap --workers 4
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from dropout.datastore import DATA_PATH, dataset_version, load_dataset
+from dropout.scoring import (DROPOUT_CLASS_CODE, add_derived_features, align_features, load_model,
+                             model_file_version, resolve_model_path)
+
+SHAP_CACHE_DIR = os.environ.get('DROPOUT_SHAP_CACHE_DIR', 'data/shap_cache')
+SHAP_CHUNK_SIZE = 2_000
+PARALLEL_MIN_ROWS = 20_000 # di bawah ini biaya start pool proses lebih besar dari hematnya
+DEPENDENCE_SAMPLE_SIZE = 5_000
+
+
+def cohort_features(df, model):
+    """Fitur model (termasuk fitur turunan) untuk setiap baris data dashboard, urutan baris sama."""
+    features = align_features(add_derived_features(df), model)
+    non_numeric = [col for col in features.columns if not pd.api.types.is_numeric_dtype(features[col])]
+    if non_numeric:
+        raise ValueError(f"kolom fitur berisi label teks, bukan kode numerik: {non_numeric}")
+    return features
+
+
+def cohort_shap_path(model_version, data_version, class_code, cache_dir=SHAP_CACHE_DIR):
+    key = re.sub(r'[^A-Za-z0-9._-]', '_', f"{model_version}__{data_version}__kelas{class_code}")
+    return os.path.join(cache_dir, f"shap__{key}.npy")
+
+
+# --- Sisi pekerja (dijalankan di tiap proses pool) ---
+_worker_explainer = None
+
+
+def _init_worker(model_path):
+    global _worker_explainer
+    from dropout.explain import ModelExplainer
+    _worker_explainer = ModelExplainer(load_model(model_path))
+
+
+def _explain_chunk(chunk, class_code):
+    return _worker_explainer.explain_class(chunk, class_code).astype(np.float32)
+
+
+class CohortShap:
+    """Matriks SHAP (n_baris x n_fitur, float32) satu kelas target, dengan nilai dasar dan nama fitur."""
+
+    def __init__(self, values, feature_names, base_value, class_code):
+        self.values = values
+        self.feature_names = pd.Index(feature_names, name='Fitur')
+        self.base_value = float(base_value)
+        self.class_code = class_code
+
+    @classmethod
+    def compute(cls, explainer, features, class_code=DROPOUT_CLASS_CODE, model_path=None,
+                chunk_size=SHAP_CHUNK_SIZE, workers=None):
+        """Hitung SHAP per potongan baris; data besar dengan `model_path` dan >1 pekerja memakai pool proses."""
+        workers = os.cpu_count() if workers is None else workers
+        chunks = [features.iloc[start:start + chunk_size] for start in range(0, len(features), chunk_size)]
+        if model_path is not None and workers > 1 and len(features) >= PARALLEL_MIN_ROWS:
+            # spawn: aman dipanggil dari proses yang sudah memiliki thread (mis. server Streamlit)
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=get_context('spawn'),
+                                     initializer=_init_worker, initargs=(model_path,)) as executor:
+                parts = list(executor.map(_explain_chunk, chunks, [class_code] * len(chunks)))
+        else:
+            parts = [explainer.explain_class(chunk, class_code).astype(np.float32) for chunk in chunks]
+        values = np.concatenate(parts) if parts else np.empty((0, features.shape[1]), dtype=np.float32)
+        return cls(values, features.columns, explainer.base_value(class_code), class_code)
+
+    def save(self, path):
+        """Simpan matriks (.npy) dan metadata (.json) secara atomik."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}.npy"
+        np.save(tmp_path, np.ascontiguousarray(self.values))
+        meta = {'feature_names': self.feature_names.tolist(), 'base_value': self.base_value, 'class_code': self.class_code}
+        with open(f"{tmp_path}.json", 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(f"{tmp_path}.json", f"{path}.json")
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(f"{path}.json", encoding='utf-8') as f:
+            meta = json.load(f)
+        return cls(np.load(path, mmap_mode='r'), meta['feature_names'], meta['base_value'], meta['class_code'])
+
+    @classmethod
+    def load_or_compute(cls, explainer_factory, features, model_version, data_version, class_code=DROPOUT_CLASS_CODE,
+                        model_path=None, workers=None, cache_dir=SHAP_CACHE_DIR):
+        """Muat matriks tersimpan; `explainer_factory()` (impor shap, model lengkap) hanya dipanggil bila harus dihitung."""
+        path = cohort_shap_path(model_version, data_version, class_code, cache_dir)
+        if os.path.exists(path) and os.path.exists(f"{path}.json"):
+            return cls.load(path)
+        cohort = cls.compute(explainer_factory(), features, class_code, model_path=model_path, workers=workers)
+        try:
+            cohort.save(path)
+        except OSError:
+            pass # direktori read-only: matriks tetap dipakai dari memori proses ini
+        return cohort
+
+    def rows(self, positions=None):
+        return self.values if positions is None else self.values[positions]
+
+    def global_importance(self, positions=None):
+        """Rata-rata |SHAP| per fitur, terurut menurun."""
+        importance = np.abs(self.rows(positions)).mean(axis=0, dtype=np.float64)
+        return pd.Series(importance, index=self.feature_names, name='Rata-rata |SHAP|').sort_values(ascending=False)
+
+    def mean_contributions(self, positions=None):
+        """Rata-rata SHAP bertanda per fitur (arah kontribusi terhadap kelas target)."""
+        return pd.Series(self.rows(positions).mean(axis=0, dtype=np.float64), index=self.feature_names, name='Rata-rata SHAP')
+
+    def dependence_frame(self, features, feature, positions=None, color=None, sample_size=DEPENDENCE_SAMPLE_SIZE, seed=0):
+        """Nilai fitur vs SHAP fitur tersebut (disampel bila baris terlalu banyak) untuk dependence plot."""
+        positions = np.arange(len(self.values)) if positions is None else np.asarray(positions)
+        if len(positions) > sample_size:
+            positions = np.sort(np.random.default_rng(seed).choice(positions, sample_size, replace=False))
+        frame = pd.DataFrame({feature: features[feature].to_numpy()[positions],
+                              'SHAP': self.values[positions, self.feature_names.get_loc(feature)]})
+        if color is not None:
+            frame[color.name] = color.to_numpy()[positions]
+        return frame
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hitung dan simpan matriks SHAP seluruh populasi untuk dashboard.")
+    parser.add_argument('data_path', nargs='?', default=DATA_PATH)
+    parser.add_argument('--model', help="Path model (default model/tuned_lightgbm_model.joblib)")
+    parser.add_argument('--workers', type=int, help="Jumlah proses pekerja (default: jumlah core)")
+    parser.add_argument('--class-code', type=int, default=DROPOUT_CLASS_CODE)
+    parser.add_argument('--cache-dir', default=SHAP_CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    from dropout.explain import ModelExplainer
+    model_path = resolve_model_path(args.model)
+    model = load_model(model_path)
+    features = cohort_features(load_dataset(args.data_path), model)
+    start = time.perf_counter()
+    cohort = CohortShap.load_or_compute(lambda: ModelExplainer(model), features, model_file_version(model_path),
+                                        dataset_version(args.data_path), args.class_code, model_path=model_path,
+                                        workers=args.workers, cache_dir=args.cache_dir)
+    path = cohort_shap_path(model_file_version(model_path), dataset_version(args.data_path), args.class_code, args.cache_dir)
+    print(f"{cohort.values.shape[0]} baris x {cohort.values.shape[1]} fitur siap di {path} "
+          f"({time.perf_counter() - start:.1f} s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
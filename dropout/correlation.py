@@ -0,0 +1,140 @@
+"""Matriks korelasi dari co-moment berjalan (n, Σx, Σx², Σxy) yang dapat digabung.
+
+Co-moment dihitung sekali per grup filter (pasangan lengkap per kolom, seperti
+`DataFrame.corr()`), lalu subset filter apa pun diperoleh dengan menjumlahkan co-moment
+grup yang cocok, tanpa memindai ulang baris data. Bila kombinasi filter hampir sebanyak baris,
+`correlation_source` memilih `corr()` langsung pada irisan baris karena lebih kecil dan lebih cepat.
+"""
+import numpy as np
+import pandas as pd
+
+from dropout.filters import ALL_OPTION
+
+
+class CoMoments:
+    """Jumlahan berpasangan untuk korelasi Pearson; nilai digeser dengan `shift` demi stabilitas numerik."""
+
+    def __init__(self, columns, shift, n, sx, sxx, sxy):
+        self.columns = list(columns)
+        self.shift = shift
+        self.n, self.sx, self.sxx, self.sxy = n, sx, sxx, sxy
+
+    @classmethod
+    def empty(cls, columns, shift):
+        p = len(columns)
+        zeros = lambda: np.zeros((p, p), dtype=np.float64)
+        return cls(columns, np.asarray(shift, dtype=np.float64), zeros(), zeros(), zeros(), zeros())
+
+    @classmethod
+    def from_frame(cls, df, columns=None, shift=None):
+        columns = list(df.columns if columns is None else columns)
+        values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        if shift is None:
+            shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(len(columns))
+        return cls.empty(columns, shift).update(values)
+
+    def update(self, values):
+        """Tambahkan baris baru (array n_baris x n_kolom, urutan kolom sama) ke jumlahan."""
+        present = np.isfinite(values)
+        centered = np.where(present, values - self.shift, 0.0)
+        mask = present.astype(np.float64)
+        # [i, j] dijumlahkan atas baris di mana kolom i dan j sama-sama terisi
+        self.n += mask.T @ mask
+        self.sx += centered.T @ mask
+        self.sxx += (centered ** 2).T @ mask
+        self.sxy += centered.T @ centered
+        return self
+
+    def merge(self, other):
+        if self.columns != other.columns or not np.array_equal(self.shift, other.shift):
+            raise ValueError("CoMoments hanya dapat digabung bila kolom dan shift sama.")
+        self.n += other.n
+        self.sx += other.sx
+        self.sxx += other.sxx
+        self.sxy += other.sxy
+        return self
+
+    def corr(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            n = np.where(self.n > 0, self.n, np.nan)
+            cov = self.sxy - self.sx * self.sx.T / n
+            var_i = self.sxx - self.sx ** 2 / n
+            var_j = var_i.T
+            corr = cov / np.sqrt(var_i * var_j)
+        corr = np.clip(corr, -1.0, 1.0)
+        np.fill_diagonal(corr, np.where(np.diag(var_i) > 0, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+class GroupedCoMoments:
+    """Co-moment per kombinasi nilai kolom filter; korelasi subset = jumlah co-moment grup yang cocok.
+
+    Grup disimpan bertumpuk: `keys` (satu baris per grup) dan array (grup x p x p) sehingga
+    pemilihan dan penjumlahan grup berjalan sebagai operasi array, bukan loop Python.
+    """
+
+    def __init__(self, df, key_columns, columns=None, shift=None):
+        self.key_columns = [col for col in key_columns if col in df.columns]
+        self.columns = list(df.select_dtypes(include=np.number).columns if columns is None else columns)
+        values = df[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        if shift is None:
+            shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(len(self.columns))
+        self.shift = np.asarray(shift, dtype=np.float64)
+        if self.key_columns:
+            indices = df.groupby(self.key_columns, observed=True, dropna=False, sort=False).indices
+            group_keys = [key if isinstance(key, tuple) else (key,) for key in indices]
+            group_positions = list(indices.values())
+        else:
+            group_keys, group_positions = [()], [np.arange(len(df))]
+        self.keys = pd.DataFrame(group_keys, columns=self.key_columns, dtype=object)
+        p = len(self.columns)
+        self.n, self.sx, self.sxx, self.sxy = (np.zeros((len(group_keys), p, p)) for _ in range(4))
+        for i, positions in enumerate(group_positions):
+            moments = CoMoments.empty(self.columns, self.shift).update(values[positions])
+            self.n[i], self.sx[i], self.sxx[i], self.sxy[i] = moments.n, moments.sx, moments.sxx, moments.sxy
+
+    @property
+    def n_groups(self):
+        return len(self.keys)
+
+    def combined(self, selections=None):
+        mask = np.ones(self.n_groups, dtype=bool)
+        for col, val in (selections or {}).items():
+            if val != ALL_OPTION and col in self.key_columns:
+                mask &= (self.keys[col] == val).to_numpy()
+        return CoMoments(self.columns, self.shift, self.n[mask].sum(axis=0), self.sx[mask].sum(axis=0),
+                         self.sxx[mask].sum(axis=0), self.sxy[mask].sum(axis=0))
+
+    def corr(self, selections=None):
+        return self.combined(selections).corr()
+
+
+class FrameCorrelation:
+    """Korelasi langsung atas baris terfilter (posisi dari `FilterIndex`), untuk data di memori."""
+
+    def __init__(self, df, filter_index, columns=None):
+        self.df = df
+        self.filter_index = filter_index
+        self.columns = list(df.select_dtypes(include=np.number).columns if columns is None else columns)
+
+    def corr(self, selections=None):
+        return self.filter_index.apply(self.df, selections or {})[self.columns].corr()
+
+
+def comoments_worthwhile(n_groups, n_rows, n_columns):
+    """Co-moment per grup (4 matriks p x p per grup) hanya sepadan bila tidak lebih besar dari kolom numeriknya sendiri."""
+    return 4 * n_groups * n_columns <= n_rows
+
+
+def correlation_source(df, key_columns, filter_index):
+    """GroupedCoMoments bila kombinasi filter jarang; selain itu corr() langsung pada baris terfilter.
+
+    Dengan banyak kolom filter, jumlah grup mendekati jumlah baris sehingga co-moment per grup
+    lebih besar dan lebih lambat dijumlahkan daripada `DataFrame.corr()` pada irisan data.
+    """
+    key_columns = [col for col in key_columns if col in df.columns]
+    columns = list(df.select_dtypes(include=np.number).columns)
+    n_groups = df.groupby(key_columns, observed=True, dropna=False).ngroups if key_columns else 1
+    if comoments_worthwhile(n_groups, len(df), len(columns)):
+        return GroupedCoMoments(df, key_columns, columns)
+    return FrameCorrelation(df, filter_index, columns)
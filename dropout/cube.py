@@ -0,0 +1,181 @@
+"""Kubus ringkasan (kolom filter x Status) untuk KPI dan tab kategorikal dashboard.
+
+Setiap sel kubus menyimpan jumlah baris serta count/sum/sum-of-squares untuk kolom numerik,
+sehingga tingkat dropout, rata-rata per Status dan grafik batang per kategori dijawab dalam
+O(jumlah grup) alih-alih O(jumlah baris) setiap kali filter berubah. Kubus dapat digabung
+(`combine`) sehingga bisa dibangun per potongan data lalu dijumlahkan; dipakai mode out-of-core.
+
+Untuk data di memori kubus penuh hampir sebanyak barisnya, sehingga `IndexedSummary` menjawab
+kueri yang sama dari marginal per kolom dan posisi `FilterIndex`.
+"""
+import numpy as np
+import pandas as pd
+
+from dropout.filters import ALL_OPTION
+
+STATUS_COL = 'Status'
+KPI_COLUMNS = ['Admission_grade', 'Curricular_units_1st_sem_approved']
+NUMERIC_SUMMARY_COLUMNS = KPI_COLUMNS + [
+    'Previous_qualification_grade', 'Age_at_enrollment', 'Curricular_units_1st_sem_grade',
+    'Curricular_units_2nd_sem_grade', 'Curricular_units_2nd_sem_approved',
+]
+
+
+class SummaryCube:
+    def __init__(self, table, key_columns, value_columns):
+        self.table = table
+        self.key_columns = list(key_columns)
+        self.value_columns = list(value_columns)
+
+    @classmethod
+    def from_frame(cls, df, key_columns, value_columns=NUMERIC_SUMMARY_COLUMNS):
+        key_columns = [col for col in key_columns if col in df.columns and col != STATUS_COL]
+        value_columns = [col for col in value_columns if col in df.columns]
+        values = df[value_columns].astype(np.float64)
+        parts = {'n': pd.Series(1, index=df.index, dtype=np.int64)}
+        for col in value_columns:
+            parts[f'{col}__n'] = values[col].notna().astype(np.int64)
+            parts[f'{col}__sum'] = values[col].fillna(0.0)
+            parts[f'{col}__sumsq'] = values[col].fillna(0.0) ** 2
+        frame = pd.DataFrame(parts)
+        group_keys = [df[col] for col in key_columns + [STATUS_COL]]
+        table = frame.groupby(group_keys, observed=True, dropna=False, sort=False).sum().reset_index()
+        return cls(table, key_columns, value_columns)
+
+    @classmethod
+    def combine(cls, cubes):
+        """Gabungkan beberapa kubus parsial (mis. per potongan file) menjadi satu."""
+        cubes = list(cubes)
+        key_columns = cubes[0].key_columns
+        table = pd.concat([cube.table for cube in cubes], ignore_index=True)
+        for col in key_columns + [STATUS_COL]:
+            if table[col].dtype.name == 'category':
+                table[col] = table[col].astype(object) # kategori tiap potongan bisa berbeda
+        table = table.groupby(key_columns + [STATUS_COL], dropna=False, sort=False).sum().reset_index()
+        return cls(table, key_columns, cubes[0].value_columns)
+
+    def select(self, selections=None):
+        """Sel kubus yang cocok dengan pilihan filter (O(jumlah grup))."""
+        table = self.table
+        if selections:
+            mask = np.ones(len(table), dtype=bool)
+            for col, val in selections.items():
+                if val != ALL_OPTION and col in self.key_columns:
+                    mask &= (table[col] == val).to_numpy()
+            table = table[mask]
+        return table
+
+    def status_counts(self, selections=None):
+        counts = self.select(selections).groupby(STATUS_COL, observed=True)['n'].sum()
+        return counts[counts > 0].sort_values(ascending=False)
+
+    def mean_by_status(self, col, selections=None):
+        grouped = self.select(selections).groupby(STATUS_COL, observed=True)[[f'{col}__n', f'{col}__sum']].sum()
+        return (grouped[f'{col}__sum'] / grouped[f'{col}__n'].replace(0, np.nan)).rename(col)
+
+    def distinct_values(self, col, selections=None):
+        table = self.select(selections)
+        return table.loc[table['n'] > 0, col].dropna().unique()
+
+    def group_status_counts(self, col, selections=None):
+        """Jumlah mahasiswa per (kategori, Status), setara groupby([col, 'Status']).size()."""
+        counts = self.select(selections).groupby([col, STATUS_COL], observed=True)['n'].sum()
+        return counts[counts > 0].rename('Jumlah').reset_index()
+
+    def group_status_percentages(self, col, selections=None):
+        """Persentase Status per kategori, setara groupby(col)['Status'].value_counts(normalize=True) * 100."""
+        return status_percentages(self.group_status_counts(col, selections), col)
+
+
+class IndexedSummary:
+    """Ringkasan KPI & tab kategorikal untuk data di memori, dengan antarmuka kueri yang sama dengan `SummaryCube`.
+
+    Kubus penuh atas semua kolom filter hampir satu sel per dua-tiga baris pada data ini, sehingga
+    memilih dan menjumlah sel kubus lebih lambat daripada menjumlah baris terfilter langsung. Di sini
+    marginal (kolom x Status) tanpa filter dihitung sekali, dan subset terfilter dijumlah dengan
+    `np.bincount` atas posisi baris dari `FilterIndex` dan kode Status/kategori yang sudah disiapkan.
+    """
+
+    def __init__(self, df, filter_index, value_columns=NUMERIC_SUMMARY_COLUMNS):
+        self.filter_index = filter_index
+        self.key_columns = list(filter_index.columns)
+        self.value_columns = [col for col in value_columns if col in df.columns]
+        status_codes, statuses = pd.factorize(df[STATUS_COL], sort=True)
+        self.statuses = list(statuses)
+        self._status_codes = status_codes
+        self._values = {col: df[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in self.value_columns}
+        # Marginal tanpa filter (tampilan awal dashboard) dihitung sekali
+        self._marginal_counts = self._count(None)[0]
+        self._marginal_sums = {col: self._value_sums(col, None) for col in self.value_columns}
+        self._marginal_groups = {col: self._group_counts(col, None) for col in self.key_columns}
+
+    # --- Penjumlahan per Status atas posisi baris (None = seluruh data) ---
+    def _count(self, positions, key_codes=None, n_keys=1, weights=None):
+        """Matriks (kode kunci x Status) berisi jumlah baris, atau jumlah `weights` bila diberikan."""
+        status = self._status_codes if positions is None else self._status_codes[positions]
+        cells = status
+        valid = status >= 0
+        if key_codes is not None:
+            keys = key_codes if positions is None else key_codes[positions]
+            cells = keys * len(self.statuses) + status
+            valid &= keys >= 0
+        if weights is not None:
+            weights = weights if positions is None else weights[positions]
+            weights = weights[valid]
+        counts = np.bincount(cells[valid], weights=weights, minlength=n_keys * len(self.statuses))
+        return counts.reshape(n_keys, len(self.statuses))
+
+    def _value_sums(self, col, positions):
+        values = self._values[col]
+        present = np.isfinite(values).astype(np.float64)
+        return self._count(positions, weights=present)[0], self._count(positions, weights=np.nan_to_num(values))[0]
+
+    def _group_counts(self, col, positions):
+        column_index = self.filter_index.columns[col]
+        return self._count(positions, column_index.codes, len(column_index.categories))
+
+    # --- Kueri (sama dengan SummaryCube) ---
+    def status_counts(self, selections=None):
+        positions = self.filter_index.positions(selections or {})
+        counts = self._marginal_counts if positions is None else self._count(positions)[0]
+        counts = pd.Series(counts, index=self.statuses, name='n')
+        counts.index.name = STATUS_COL
+        return counts[counts > 0].sort_values(ascending=False)
+
+    def mean_by_status(self, col, selections=None):
+        positions = self.filter_index.positions(selections or {})
+        n, total = self._marginal_sums[col] if positions is None else self._value_sums(col, positions)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = pd.Series(np.where(n > 0, total / n, np.nan), index=self.statuses, name=col)
+        means.index.name = STATUS_COL
+        return means
+
+    def _group_table(self, col, selections):
+        positions = self.filter_index.positions(selections or {})
+        return self._marginal_groups[col] if positions is None else self._group_counts(col, positions)
+
+    def distinct_values(self, col, selections=None):
+        categories = self.filter_index.columns[col].categories
+        present = self._group_table(col, selections).sum(axis=1) > 0
+        return np.array([category for category, keep in zip(categories, present) if keep], dtype=object)
+
+    def group_status_counts(self, col, selections=None):
+        """Jumlah mahasiswa per (kategori, Status), setara groupby([col, 'Status']).size()."""
+        table = self._group_table(col, selections)
+        category_idx, status_idx = np.nonzero(table)
+        categories = self.filter_index.columns[col].categories
+        return pd.DataFrame({
+            col: [categories[i] for i in category_idx],
+            STATUS_COL: [self.statuses[j] for j in status_idx],
+            'Jumlah': table[category_idx, status_idx].astype(np.int64),
+        })
+
+    def group_status_percentages(self, col, selections=None):
+        """Persentase Status per kategori, setara groupby(col)['Status'].value_counts(normalize=True) * 100."""
+        return status_percentages(self.group_status_counts(col, selections), col)
+
+
+def status_percentages(counts, col):
+    """Ubah tabel (col, Status, Jumlah) menjadi persentase Status per kategori."""
+    totals = counts.groupby(col, observed=True)['Jumlah'].transform('sum')
+    return counts.assign(Persentase=counts['Jumlah'] / totals * 100).drop(columns='Jumlah')
@@ -0,0 +1,135 @@
+"""Penyimpanan kolumnar (Parquet) untuk data visualisasi.
+
+`data/data.csv` (pemisah `;`) dibersihkan sekali: nama kolom dinormalisasi, kolom numerik
+dikonversi, dan kolom label disimpan sebagai categorical. Hasilnya ditulis ke Parquet yang
+dibaca dengan memory-map; CSV hanya diparse ulang bila lebih baru dari file Parquet::
+
+    python -m dropout.datastore              # bangun ulang data/data.parquet
+
+Sumber data dashboard dapat diganti lewat variabel lingkungan `DROPOUT_DATA_PATH`.
+"""
+import argparse
+import os
+import sys
+import warnings
+
+import pandas as pd
+
+from dropout.schema import apply_dtype_plan, memory_report
+from dropout.scoring import normalize_column_names, sniff_separator
+
+DATA_PATH = os.environ.get("DROPOUT_DATA_PATH", "data/data.csv")
+
+POTENTIAL_NUMERIC_COLS = [
+    'Previous_qualification_grade', 'Admission_grade',
+    'Curricular_units_1st_sem_grade', 'Curricular_units_2nd_sem_grade',
+    'Age_at_enrollment', 'Unemployment_rate', 'Inflation_rate', 'GDP',
+    'Curricular_units_1st_sem_credited', 'Curricular_units_1st_sem_enrolled',
+    'Curricular_units_1st_sem_evaluations', 'Curricular_units_1st_sem_approved',
+    'Curricular_units_2nd_sem_credited', 'Curricular_units_2nd_sem_enrolled',
+    'Curricular_units_2nd_sem_evaluations', 'Curricular_units_2nd_sem_approved',
+    'Application_order'
+]
+
+
+def parquet_path_for(csv_path):
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def dataset_version(csv_path=DATA_PATH, parquet_path=None):
+    """Versi data (mtime & ukuran file sumber) untuk kunci cache; berubah saat file sumber diperbarui."""
+    if os.path.isdir(csv_path): # dataset Parquet terpartisi: gabungan mtime terbaru & total ukuran file
+        stats = [os.stat(os.path.join(root, name)) for root, _, files in os.walk(csv_path) for name in files]
+        latest = max((stat.st_mtime_ns for stat in stats), default=0)
+        return f"{os.path.basename(os.path.normpath(csv_path))}/:{len(stats)}:{latest}:{sum(stat.st_size for stat in stats)}"
+    source_path = csv_path if os.path.exists(csv_path) else (parquet_path or parquet_path_for(csv_path))
+    if not os.path.exists(source_path):
+        return ""
+    stat = os.stat(source_path)
+    return f"{os.path.basename(source_path)}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def clean_raw_frame(df):
+    """Pembersihan yang sama dengan loader dashboard: Status, nama kolom, kolom numerik, categorical."""
+    df = df.drop(columns=[col for col in df.columns if str(col).startswith('Unnamed:')]) # kolom kosong dari pemisah berlebih
+    if 'Status' in df.columns:
+        df['Status'] = df['Status'].str.strip()
+    df.columns = normalize_column_names(df.columns)
+    for col in POTENTIAL_NUMERIC_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    for col in df.columns[df.dtypes == 'object']:
+        df[col] = df[col].astype('category')
+    return validate_dtypes(df)
+
+
+def validate_dtypes(df):
+    """Terapkan rencana dtype (int8/int16, float32, categorical); pelanggaran skema diberi peringatan."""
+    df, report = apply_dtype_plan(df)
+    if report.issues:
+        warnings.warn("Kolom tidak sesuai skema dtype, dtype asli dipertahankan: " + "; ".join(report.issues))
+    return df
+
+
+def read_csv_dataset(csv_path=DATA_PATH):
+    """Baca data.csv (pemisah ;) atau data_mapped.csv (pemisah ,); pemisah dideteksi dari header."""
+    with open(csv_path, encoding='utf-8-sig') as f:
+        sep = sniff_separator(f.readline())
+    return clean_raw_frame(pd.read_csv(csv_path, sep=sep, encoding='utf-8-sig'))
+
+
+def write_parquet(df, parquet_path):
+    """Tulis Parquet secara atomik (file sementara lalu os.replace) agar pembaca lain tidak melihat file setengah jadi."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    tmp_path = f"{parquet_path}.tmp-{os.getpid()}"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path, compression='zstd')
+    os.replace(tmp_path, parquet_path)
+
+
+def build_parquet(csv_path=DATA_PATH, parquet_path=None):
+    parquet_path = parquet_path or parquet_path_for(csv_path)
+    df = read_csv_dataset(csv_path)
+    write_parquet(df, parquet_path)
+    return df
+
+
+def is_parquet_fresh(csv_path, parquet_path):
+    if not os.path.exists(parquet_path):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    return os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+
+
+def load_dataset(csv_path=DATA_PATH, parquet_path=None, columns=None):
+    """Muat data bersih dari Parquet (memory-map); parse CSV dan perbarui Parquet hanya bila CSV lebih baru."""
+    parquet_path = parquet_path or parquet_path_for(csv_path)
+    if is_parquet_fresh(csv_path, parquet_path):
+        import pyarrow.parquet as pq
+        table = pq.read_table(parquet_path, columns=columns, memory_map=True)
+        return validate_dtypes(table.to_pandas(split_blocks=True, self_destruct=True))
+
+    df = read_csv_dataset(csv_path)
+    try:
+        write_parquet(df, parquet_path)
+    except OSError:
+        pass # Direktori data bisa read-only (mis. di hosting); tetap pakai hasil parse CSV
+    return df[columns] if columns is not None else df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bangun file Parquet bertipe dari data CSV mahasiswa.")
+    parser.add_argument('csv_path', nargs='?', default=DATA_PATH)
+    parser.add_argument('-o', '--output', help="Path Parquet (default: nama CSV dengan ekstensi .parquet)")
+    args = parser.parse_args(argv)
+
+    parquet_path = args.output or parquet_path_for(args.csv_path)
+    df = build_parquet(args.csv_path, parquet_path)
+    print(f"{len(df)} baris, {df.shape[1]} kolom ditulis ke {parquet_path}", file=sys.stderr)
+    print(memory_report(df).summary(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
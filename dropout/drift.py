@@ -0,0 +1,291 @@
+"""Monitor drift & kualitas data: input yang diskor dibandingkan dengan distribusi data latih.
+
+Referensi dibangun sekali dari `data/X_train.csv`. File tersebut sudah distandardisasi;
+scaler-nya di-fit pada seluruh `data/data.csv` (mean & std populasi), sehingga nilai asli
+dipulihkan dengan statistik data.csv. Kolom yang pemulihannya tidak cocok persis (mis. rumus
+fitur turunan berbeda) tidak dipantau.
+
+Setiap kolom diringkas dalam sketsa yang dapat digabung: tabel frekuensi untuk kode/jumlah
+diskret dan histogram dengan batas bin tetap (kuantil data latih) untuk nilai kontinu. Batch
+atau isian form diringkas dengan batas yang sama (O(batch)), dibandingkan dengan PSI/KS, lalu
+digabung ke sketsa kumulatif tanpa memindai ulang data latih. PSI dikoreksi bias sampel kecil dan
+baru dihitung mulai ~10 baris per bin, sehingga sampel dari distribusi latih tidak memicu peringatan::
+
+    python -m dropout.drift data_batch.csv
+"""
+import argparse
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dropout.scoring import add_derived_features, normalize_column_names, sniff_separator
+
+X_TRAIN_PATH = 'data/X_train.csv'
+X_TEST_PATH = 'data/X_test.csv'
+SCALER_SOURCE_PATH = 'data/data.csv'
+
+MAX_CATEGORIES = 30 # kolom bilangan bulat dengan nilai unik <= ini diperlakukan sebagai kategori
+HISTOGRAM_BINS = 20
+PSI_WARNING, PSI_ALERT = 0.1, 0.25
+KS_ALERT = 0.2
+MIN_ROWS_FOR_DISTRIBUTION = 10 * HISTOGRAM_BINS # ~10 baris per bin; batch lebih kecil cukup dicek rentang per baris
+TAIL_QUANTILE = 0.005
+_PSEUDO_COUNT = 0.5
+_DECIMALS = 4 # pembulatan nilai sebelum di-bin: sisa invers scaler/float32 tidak boleh memindah bin
+
+
+def _psi(expected, actual):
+    """Population Stability Index dari dua vektor jumlah pada bin yang sama, dikoreksi bias sampel kecil.
+
+    Untuk dua sampel dari distribusi yang sama, PSI bernilai sekitar (k - 1) * (1/n + 1/m) dengan k
+    jumlah bin terisi; bias ini dikurangkan agar batch kecil tidak memicu peringatan semu.
+    """
+    n_expected, n_actual = expected.sum(), actual.sum()
+    bias = (np.count_nonzero(expected + actual) - 1) * (1 / max(n_expected, 1) + 1 / max(n_actual, 1))
+    # Pseudo-count setengah per bin: kategori langka yang kebetulan kosong/terisi sekali tidak mendominasi PSI
+    expected = (expected + _PSEUDO_COUNT) / (n_expected + _PSEUDO_COUNT * len(expected))
+    actual = (actual + _PSEUDO_COUNT) / (n_actual + _PSEUDO_COUNT * len(actual))
+    return max(float(np.sum((actual - expected) * np.log(actual / expected))) - bias, 0.0)
+
+
+class CategorySketch:
+    """Tabel frekuensi nilai diskret (kode kategori, jumlah SKS)."""
+
+    kind = 'kategori'
+
+    def __init__(self, counts=None, n_missing=0):
+        self.counts = dict(counts or {})
+        self.n_missing = n_missing
+
+    def empty_like(self):
+        return CategorySketch()
+
+    @property
+    def n(self):
+        return sum(self.counts.values())
+
+    def update(self, values):
+        values = pd.Series(values)
+        self.n_missing += int(values.isna().sum())
+        for value, count in values.dropna().value_counts().items():
+            key = float(value)
+            self.counts[key] = self.counts.get(key, 0) + int(count)
+        return self
+
+    def merge(self, other):
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        self.n_missing += other.n_missing
+        return self
+
+    def compare(self, other):
+        """PSI antar kategori referensi (+ satu bin untuk kategori baru) dan porsi kategori baru."""
+        keys = sorted(self.counts)
+        expected = np.array([self.counts[key] for key in keys] + [0], dtype=np.float64)
+        unseen = sum(count for value, count in other.counts.items() if value not in self.counts)
+        actual = np.array([other.counts.get(key, 0) for key in keys] + [unseen], dtype=np.float64)
+        return {'PSI': _psi(expected, actual), 'KS': np.nan, 'Porsi di luar referensi': unseen / max(other.n, 1)}
+
+    def out_of_reference(self, value):
+        return float(value) not in self.counts
+
+
+class HistogramSketch:
+    """Histogram dengan batas bin tetap (ditambah bin bawah/atas), beserta min/maks yang diamati."""
+
+    kind = 'histogram'
+
+    def __init__(self, edges, counts=None, n_missing=0, low=np.inf, high=-np.inf, tails=(-np.inf, np.inf)):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        self.n_missing = n_missing
+        self.low, self.high = low, high
+        self.tails = tails # kuantil ekor referensi untuk peringatan per baris
+
+    @classmethod
+    def from_reference(cls, values, n_bins=HISTOGRAM_BINS):
+        values = np.asarray(values, dtype=np.float64)
+        finite = values[np.isfinite(values)]
+        # Bin terluar (di bawah minimum / di atas maksimum data latih) kosong pada referensi
+        edges = np.unique(np.concatenate([np.quantile(finite, np.linspace(0, 1, n_bins + 1)[:-1]),
+                                          [np.nextafter(finite.max(), np.inf)]])) if len(finite) else np.empty(0)
+        tails = tuple(np.quantile(finite, [TAIL_QUANTILE, 1 - TAIL_QUANTILE])) if len(finite) else (-np.inf, np.inf)
+        return cls(edges, tails=tails).update(values)
+
+    def empty_like(self):
+        return HistogramSketch(self.edges, tails=self.tails)
+
+    @property
+    def n(self):
+        return int(self.counts.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        finite = values[np.isfinite(values)]
+        self.n_missing += int(len(values) - len(finite))
+        if len(finite):
+            self.counts += np.bincount(np.searchsorted(self.edges, finite, side='right'), minlength=len(self.counts))
+            self.low, self.high = min(self.low, float(finite.min())), max(self.high, float(finite.max()))
+        return self
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.n_missing += other.n_missing
+        self.low, self.high = min(self.low, other.low), max(self.high, other.high)
+        return self
+
+    def compare(self, other):
+        """PSI per bin dan statistik KS (selisih CDF maksimum pada batas bin bersama)."""
+        expected, actual = self.counts.astype(np.float64), other.counts.astype(np.float64)
+        cdf_expected = np.cumsum(expected) / max(expected.sum(), 1)
+        cdf_actual = np.cumsum(actual) / max(actual.sum(), 1)
+        return {'PSI': _psi(expected, actual), 'KS': float(np.max(np.abs(cdf_expected - cdf_actual))),
+                'Porsi di luar referensi': (actual[0] + actual[-1]) / max(other.n, 1)}
+
+    def out_of_reference(self, value):
+        return not (self.tails[0] <= float(value) <= self.tails[1])
+
+
+def _raw_training_frame(path=SCALER_SOURCE_PATH):
+    with open(path, encoding='utf-8-sig') as f:
+        sep = sniff_separator(f.readline())
+    df = pd.read_csv(path, sep=sep, encoding='utf-8-sig')
+    df.columns = normalize_column_names(df.columns)
+    return add_derived_features(df.drop(columns=['Status'], errors='ignore'))
+
+
+def recover_training_frame(x_train_path=X_TRAIN_PATH, x_test_path=X_TEST_PATH, raw_path=SCALER_SOURCE_PATH, atol=1e-6):
+    """Kembalikan X_train ke satuan asli; hanya kolom yang standardisasinya terverifikasi persis."""
+    x_train = pd.read_csv(x_train_path)
+    x_all = pd.concat([x_train, pd.read_csv(x_test_path)], ignore_index=True)
+    raw = _raw_training_frame(raw_path)
+    recovered = {}
+    for col in x_train.columns:
+        if col not in raw.columns or len(raw) != len(x_all):
+            continue
+        values = raw[col].astype(np.float64)
+        mean, std = values.mean(), values.std(ddof=0)
+        if not std > 0:
+            continue
+        # Scaler di-fit pada seluruh data: X_train ∪ X_test harus sama dengan data.csv terstandardisasi
+        if np.allclose(np.sort(((values - mean) / std).to_numpy()), np.sort(x_all[col].to_numpy()), atol=atol):
+            recovered[col] = np.round(x_train[col].to_numpy() * std + mean, _DECIMALS)
+    return pd.DataFrame(recovered)
+
+
+class DriftReference:
+    """Sketsa per kolom dari data latih (dibangun sekali per proses)."""
+
+    def __init__(self, sketches):
+        self.sketches = sketches
+
+    @classmethod
+    def from_frame(cls, df, max_categories=MAX_CATEGORIES):
+        sketches = {}
+        for col in df.columns:
+            values = np.round(df[col].to_numpy(dtype=np.float64), _DECIMALS)
+            finite = values[np.isfinite(values)]
+            is_discrete = np.array_equal(finite, np.round(finite)) and len(np.unique(finite)) <= max_categories
+            sketches[col] = CategorySketch().update(values) if is_discrete else HistogramSketch.from_reference(values)
+        return cls(sketches)
+
+    @classmethod
+    def from_training(cls, x_train_path=X_TRAIN_PATH, x_test_path=X_TEST_PATH, raw_path=SCALER_SOURCE_PATH):
+        return cls.from_frame(recover_training_frame(x_train_path, x_test_path, raw_path))
+
+
+class DriftMonitor:
+    """Bandingkan setiap batch/isian form dengan referensi dan akumulasikan sketsanya (thread-safe)."""
+
+    def __init__(self, reference):
+        self.reference = reference
+        self.observed = {col: sketch.empty_like() for col, sketch in reference.sketches.items()}
+        self.batches = 0
+        self._lock = threading.Lock()
+
+    @property
+    def n_observed(self):
+        return max((sketch.n + sketch.n_missing for sketch in self.observed.values()), default=0)
+
+    def observe(self, df):
+        """Ringkas batch (O(baris batch)), gabungkan ke sketsa kumulatif, kembalikan laporan batch."""
+        values = {col: np.round(pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64), _DECIMALS)
+                  for col in self.reference.sketches if col in df.columns}
+        batch = {col: self.reference.sketches[col].empty_like().update(column) for col, column in values.items()}
+        with self._lock:
+            for col, sketch in batch.items():
+                self.observed[col].merge(sketch)
+            self.batches += 1
+        report = self._report(batch)
+        report['Nilai tidak biasa'] = [
+            sum(self.reference.sketches[col].out_of_reference(v) for v in values[col][np.isfinite(values[col])])
+            for col in report.index
+        ] if len(df) < MIN_ROWS_FOR_DISTRIBUTION else 0
+        report.attrs['missing_columns'] = [col for col in self.reference.sketches if col not in df.columns]
+        return report
+
+    def cumulative_report(self):
+        with self._lock:
+            observed = {col: sketch for col, sketch in self.observed.items() if sketch.n + sketch.n_missing > 0}
+            return self._report(observed)
+
+    def _report(self, sketches):
+        rows = []
+        for col, sketch in sketches.items():
+            n_rows = sketch.n + sketch.n_missing
+            stats = self.reference.sketches[col].compare(sketch)
+            if n_rows < MIN_ROWS_FOR_DISTRIBUTION:
+                stats['PSI'] = stats['KS'] = np.nan # terlalu sedikit baris untuk uji distribusi
+            rows.append({'Fitur': col, 'Jenis': sketch.kind, 'Baris': n_rows, **stats,
+                         'Porsi kosong': sketch.n_missing / max(n_rows, 1)})
+        report = pd.DataFrame(rows, columns=['Fitur', 'Jenis', 'Baris', 'PSI', 'KS', 'Porsi di luar referensi', 'Porsi kosong'])
+        report = report.set_index('Fitur')
+        report['Status'] = [drift_status(row) for _, row in report.iterrows()]
+        return report
+
+
+def drift_status(row):
+    if row['PSI'] >= PSI_ALERT or row['KS'] >= KS_ALERT or row['Porsi kosong'] > 0.05:
+        return 'Peringatan'
+    if row['PSI'] >= PSI_WARNING or row['Porsi di luar referensi'] > 0.05:
+        return 'Perhatikan'
+    return 'OK'
+
+
+def drift_alerts(report, include_missing=True):
+    """Pesan singkat per fitur yang perlu perhatian (untuk ditampilkan di aplikasi)."""
+    alerts = []
+    for col, row in report.iterrows():
+        if row['Status'] != 'OK':
+            parts = [f"{name} {row[name]:.2f}" for name in ('PSI', 'KS') if pd.notna(row[name])]
+            parts += [f"{name.lower()} {row[name]:.0%}" for name in ('Porsi di luar referensi', 'Porsi kosong') if row[name] > 0]
+            alerts.append(f"{col}: " + ", ".join(parts))
+        elif row.get('Nilai tidak biasa', 0):
+            alerts.append(f"{col}: nilai di luar rentang yang umum pada data latih")
+    for col in report.attrs.get('missing_columns', []) if include_missing else []:
+        alerts.append(f"{col}: kolom tidak ada di input")
+    return alerts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bandingkan file input skoring dengan distribusi data latih (PSI/KS).")
+    parser.add_argument('input', help="File CSV input (nama kolom seperti data/data.csv)")
+    parser.add_argument('--x-train', default=X_TRAIN_PATH)
+    args = parser.parse_args(argv)
+
+    monitor = DriftMonitor(DriftReference.from_training(args.x_train))
+    with open(args.input, encoding='utf-8-sig') as f:
+        sep = sniff_separator(f.readline())
+    batch = pd.read_csv(args.input, sep=sep, encoding='utf-8-sig')
+    batch.columns = normalize_column_names(batch.columns)
+    report = monitor.observe(add_derived_features(batch))
+    print(report.round(3).to_string())
+    for alert in drift_alerts(report):
+        print(f"PERINGATAN {alert}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Layanan penjelasan SHAP: TreeExplainer dibuat sekali per model dan outputnya dinormalisasi.
+
+TreeExplainer bisa mengembalikan list per kelas, array 2D (satu output), atau array 3D
+(baris x fitur x kelas) tergantung versi shap dan jenis model. `ModelExplainer` menyeragamkan
+semuanya menjadi array 3D `(n_baris, n_fitur, n_output)` sehingga pemanggil cukup memilih kelas.
+"""
+from functools import cached_property
+
+import numpy as np
+
+SUPPORTED_MODEL_TYPES = ('LGBMClassifier', 'XGBClassifier', 'RandomForestClassifier')
+
+
+def is_tree_model(model):
+    return type(model).__name__ in SUPPORTED_MODEL_TYPES
+
+
+def normalize_shap_output(shap_values, n_rows, n_features):
+    """Ubah output shap_values apa pun menjadi array float64 berbentuk (n_baris, n_fitur, n_output)."""
+    if isinstance(shap_values, list):
+        values = np.stack([np.asarray(class_values) for class_values in shap_values], axis=-1)
+    else:
+        values = np.asarray(shap_values)
+    if values.ndim == 1:
+        values = values.reshape(1, -1)
+    if values.ndim == 2:
+        values = values[:, :, np.newaxis]
+    if values.ndim != 3:
+        raise ValueError(f"Struktur SHAP values tidak terduga: dimensi {values.ndim}")
+    if values.shape[:2] != (n_rows, n_features) and values.shape[1:] == (n_rows, n_features):
+        values = np.moveaxis(values, 0, -1) # (kelas, baris, fitur) -> (baris, fitur, kelas)
+    if values.shape[:2] != (n_rows, n_features):
+        raise ValueError(f"Bentuk SHAP values {values.shape} tidak cocok dengan data ({n_rows}, {n_features})")
+    return values.astype(np.float64, copy=False)
+
+
+class ModelExplainer:
+    """TreeExplainer yang dibuat sekali per model, dengan penjelasan batch dan expected_value tersimpan."""
+
+    def __init__(self, model):
+        import shap
+        self.model = model
+        self.explainer = shap.TreeExplainer(model)
+
+    @cached_property
+    def expected_values(self):
+        return np.atleast_1d(np.asarray(self.explainer.expected_value, dtype=np.float64))
+
+    def class_index(self, class_code):
+        """Indeks output untuk kelas tertentu; model satu output selalu memakai indeks 0."""
+        return class_code if self.expected_values.shape[0] > class_code else 0
+
+    def base_value(self, class_code):
+        return float(self.expected_values[self.class_index(class_code)])
+
+    def explain(self, features_df):
+        """SHAP semua kelas untuk N baris dalam satu panggilan: array (n_baris, n_fitur, n_output)."""
+        shap_values = self.explainer.shap_values(features_df)
+        return normalize_shap_output(shap_values, len(features_df), features_df.shape[1])
+
+    def explain_class(self, features_df, class_code):
+        """Matriks SHAP (n_baris, n_fitur) untuk satu kelas target."""
+        return self.explain(features_df)[:, :, self.class_index(class_code)]
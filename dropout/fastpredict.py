@@ -0,0 +1,229 @@
+"""Inferensi LightGBM langsung di atas array NumPy contiguous, tanpa wrapper sklearn.
+
+Probabilitas dihitung satu kali dan label diturunkan dari argmax, sehingga tidak ada traversal
+ganda predict + predict_proba maupun validasi pandas per panggilan. Booster juga diratakan
+menjadi array node (fitur split, threshold, anak kiri/kanan, arah default untuk missing, nilai
+daun) yang dapat ditelusuri secara vektor dengan NumPy tanpa objek LightGBM.
+
+Input memakai float64: threshold LightGBM bertipe double, dan pembulatan ke float32 dapat
+memindahkan nilai yang dekat threshold ke cabang lain (selisih probabilitas hingga ~0.03 pada
+data/X_test.csv).
+
+Paritas dengan model joblib dapat diperiksa dengan::
+
+    python -m dropout.fastpredict --check data/X_test.csv
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+MISSING_NONE, MISSING_ZERO, MISSING_NAN = 0, 1, 2
+_MISSING_TYPES = {'None': MISSING_NONE, 'Zero': MISSING_ZERO, 'NaN': MISSING_NAN}
+_ZERO_THRESHOLD = 1e-35 # kZeroThreshold di LightGBM
+ROW_BLOCK_SIZE = 4_096 # batasi matriks (baris x pohon) sementara
+
+
+class UnsupportedModelError(ValueError):
+    """Model tidak dapat diratakan menjadi array pohon (mis. split kategorikal, objective lain, bukan LightGBM)."""
+
+
+class FlatTreeEnsemble:
+    """Representasi pohon LightGBM berbasis array (semua pohon dalam satu ruang indeks node)."""
+
+    ARRAY_FIELDS = ('split_feature', 'threshold', 'left_child', 'right_child', 'default_left',
+                    'missing_type', 'is_leaf', 'leaf_value', 'tree_roots')
+
+    def __init__(self, arrays, num_class, max_depth, objective):
+        for field in self.ARRAY_FIELDS:
+            setattr(self, field, arrays[field])
+        self.num_class = int(num_class)
+        self.max_depth = int(max_depth)
+        self.objective = objective
+
+    def arrays(self):
+        return {field: getattr(self, field) for field in self.ARRAY_FIELDS}
+
+    @staticmethod
+    def check_supported(dump):
+        """Hanya gbdt dengan `multiclass` (softmax) atau `binary sigmoid:1` yang transformasinya ditiru predict_proba."""
+        if dump.get('average_output'):
+            raise UnsupportedModelError("Model boosting 'rf' (rata-rata output pohon) belum didukung inferensi native.")
+        objective, *options = dump['objective'].split()
+        params = dict(option.split(':', 1) for option in options if ':' in option)
+        if objective == 'multiclass':
+            return
+        if objective == 'binary' and float(params.get('sigmoid', 1.0)) == 1.0:
+            return
+        raise UnsupportedModelError(f"Objective '{dump['objective']}' belum didukung inferensi native.")
+
+    @classmethod
+    def from_booster(cls, booster):
+        dump = booster.dump_model()
+        cls.check_supported(dump)
+        nodes = {field: [] for field in cls.ARRAY_FIELDS if field != 'tree_roots'}
+        tree_roots = []
+        max_depth = 0
+
+        def add_node(node, depth):
+            nonlocal max_depth
+            index = len(nodes['is_leaf'])
+            for field in nodes:
+                nodes[field].append(0)
+            if 'split_index' not in node:
+                max_depth = max(max_depth, depth)
+                nodes['is_leaf'][index] = True
+                nodes['leaf_value'][index] = node['leaf_value']
+                nodes['left_child'][index] = nodes['right_child'][index] = index
+                return index
+            if node['decision_type'] != '<=':
+                raise UnsupportedModelError(f"Split kategorikal ({node['decision_type']}) belum didukung inferensi native.")
+            nodes['split_feature'][index] = node['split_feature']
+            nodes['threshold'][index] = node['threshold']
+            nodes['default_left'][index] = node['default_left']
+            nodes['missing_type'][index] = _MISSING_TYPES[node['missing_type']]
+            nodes['left_child'][index] = add_node(node['left_child'], depth + 1)
+            nodes['right_child'][index] = add_node(node['right_child'], depth + 1)
+            return index
+
+        for tree in dump['tree_info']:
+            tree_roots.append(add_node(tree['tree_structure'], 0))
+
+        arrays = {
+            'split_feature': np.asarray(nodes['split_feature'], dtype=np.int32),
+            'threshold': np.asarray(nodes['threshold'], dtype=np.float64),
+            'left_child': np.asarray(nodes['left_child'], dtype=np.int32),
+            'right_child': np.asarray(nodes['right_child'], dtype=np.int32),
+            'default_left': np.asarray(nodes['default_left'], dtype=bool),
+            'missing_type': np.asarray(nodes['missing_type'], dtype=np.int8),
+            'is_leaf': np.asarray(nodes['is_leaf'], dtype=bool),
+            'leaf_value': np.asarray(nodes['leaf_value'], dtype=np.float64),
+            'tree_roots': np.asarray(tree_roots, dtype=np.int32),
+        }
+        return cls(arrays, dump['num_tree_per_iteration'], max_depth, dump['objective'])
+
+    def _leaf_nodes(self, X):
+        nodes = np.broadcast_to(self.tree_roots, (X.shape[0], self.tree_roots.size)).copy()
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        for _ in range(self.max_depth):
+            values = X[rows, self.split_feature[nodes]].astype(np.float64)
+            missing_type = self.missing_type[nodes]
+            is_nan = np.isnan(values)
+            values = np.where(is_nan & (missing_type != MISSING_NAN), 0.0, values)
+            is_missing = ((missing_type == MISSING_ZERO) & (np.abs(values) <= _ZERO_THRESHOLD)) | ((missing_type == MISSING_NAN) & is_nan)
+            go_left = np.where(is_missing, self.default_left[nodes], values <= self.threshold[nodes])
+            nodes = np.where(go_left, self.left_child[nodes], self.right_child[nodes])
+        return nodes
+
+    def raw_score(self, X):
+        """Skor mentah (n_baris, n_kelas): jumlah nilai daun per kelas."""
+        scores = np.empty((X.shape[0], self.num_class), dtype=np.float64)
+        for start in range(0, X.shape[0], ROW_BLOCK_SIZE):
+            leaf_values = self.leaf_value[self._leaf_nodes(X[start:start + ROW_BLOCK_SIZE])]
+            # Pohon tersusun per iterasi: [iter0_kelas0, iter0_kelas1, ..., iter1_kelas0, ...]
+            scores[start:start + ROW_BLOCK_SIZE] = leaf_values.reshape(leaf_values.shape[0], -1, self.num_class).sum(axis=1)
+        return scores
+
+    def predict_proba(self, X):
+        scores = self.raw_score(X)
+        if self.num_class > 1:
+            scores -= scores.max(axis=1, keepdims=True)
+            np.exp(scores, out=scores)
+            return scores / scores.sum(axis=1, keepdims=True)
+        positive = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+        return np.column_stack([1.0 - positive, positive])
+
+
+class FastInferenceEngine:
+    """Pengganti LGBMClassifier untuk skoring: atribut `classes_`/`feature_names_in_` dan API predict sama.
+
+    Dengan booster tersedia, prediksi memanggil `Booster.predict` (C++) langsung pada array contiguous;
+    tanpa booster (mis. dari array bersama) dipakai `FlatTreeEnsemble` berbasis NumPy.
+    """
+
+    def __init__(self, ensemble, classes, feature_names, booster=None, dtype=np.float64):
+        self.ensemble = ensemble
+        self.classes_ = np.asarray(classes)
+        self.feature_names_in_ = np.asarray(feature_names)
+        self.booster = booster
+        self.dtype = dtype
+
+    @classmethod
+    def from_model(cls, model, dtype=np.float64):
+        feature_names = getattr(model, 'feature_names_in_', None)
+        if feature_names is None:
+            feature_names = model.booster_.feature_name()
+        return cls(FlatTreeEnsemble.from_booster(model.booster_), model.classes_, feature_names,
+                   booster=model.booster_, dtype=dtype)
+
+    def to_array(self, X):
+        if isinstance(X, pd.DataFrame):
+            X = X[list(self.feature_names_in_)].to_numpy(dtype=self.dtype, na_value=np.nan)
+        return np.ascontiguousarray(X, dtype=self.dtype)
+
+    def predict_proba(self, X):
+        X = self.to_array(X)
+        if self.booster is None:
+            return self.ensemble.predict_proba(X)
+        proba = self.booster.predict(X)
+        return proba if proba.ndim == 2 else np.column_stack([1.0 - proba, proba])
+
+    def predict_with_proba(self, X):
+        """Probabilitas dihitung sekali; label diturunkan dari argmax."""
+        proba = self.predict_proba(X)
+        return self.classes_[proba.argmax(axis=1)], proba
+
+    def predict(self, X):
+        return self.predict_with_proba(X)[0]
+
+    def without_booster(self):
+        """Salinan yang hanya memakai array pohon (tanpa objek booster LightGBM)."""
+        return FastInferenceEngine(self.ensemble, self.classes_, self.feature_names_in_, dtype=self.dtype)
+
+
+def build_inference_engine(model):
+    """Engine native bila model LightGBM didukung; selain itu model asli dikembalikan."""
+    if not hasattr(model, 'booster_'):
+        return model
+    try:
+        return FastInferenceEngine.from_model(model)
+    except UnsupportedModelError:
+        return model
+
+
+def check_parity(model, X, atol=1e-9):
+    """Bandingkan engine native (jalur booster & jalur array) dengan model.predict_proba/predict.
+
+    Mengembalikan selisih absolut maksimum; AssertionError bila melebihi `atol` atau label berbeda.
+    """
+    engine = FastInferenceEngine.from_model(model)
+    X = X[list(engine.feature_names_in_)] if isinstance(X, pd.DataFrame) else X
+    expected_proba = model.predict_proba(X)
+    expected_labels = model.predict(X)
+    max_diff = 0.0
+    for candidate in (engine, engine.without_booster()):
+        labels, proba = candidate.predict_with_proba(X)
+        max_diff = max(max_diff, float(np.abs(proba - expected_proba).max()))
+        if max_diff > atol or not np.array_equal(labels, expected_labels):
+            raise AssertionError(f"Engine native tidak sama dengan model (selisih maks {max_diff:.3g}).")
+    return max_diff
+
+
+def main(argv=None):
+    from dropout.scoring import load_model
+
+    parser = argparse.ArgumentParser(description="Periksa paritas inferensi native dengan model LightGBM.")
+    parser.add_argument('--check', default='data/X_test.csv', help="CSV fitur untuk uji paritas")
+    parser.add_argument('--model', help="Path model (default model/tuned_lightgbm_model.joblib)")
+    parser.add_argument('--atol', type=float, default=1e-9)
+    args = parser.parse_args(argv)
+
+    model = load_model(args.model)
+    max_diff = check_parity(model, pd.read_csv(args.check), atol=args.atol)
+    print(f"Paritas OK: selisih probabilitas maksimum {max_diff:.3g}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
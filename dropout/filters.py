@@ -0,0 +1,64 @@
+"""Indeks filter sidebar dashboard yang dibangun sekali per versi data.
+
+Untuk setiap kolom kategorikal disimpan kode kategori dan array posisi baris (terurut) per
+kategori. Pilihan filter diselesaikan dengan irisan array posisi, tanpa menyalin atau
+memindai ulang seluruh DataFrame pada setiap interaksi widget.
+"""
+import numpy as np
+import pandas as pd
+
+ALL_OPTION = 'Semua'
+MAX_FILTER_CARDINALITY = 20
+
+
+def is_label_column(series):
+    return series.dtype.name in ('object', 'category')
+
+
+class ColumnIndex:
+    """Posisi baris per kategori untuk satu kolom (kategori NaN tidak diindeks)."""
+
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series, sort=True)
+        self.categories = list(uniques)
+        self.codes = codes # kode kategori per baris (-1 = NaN), urutan sama dengan `categories`
+        order = np.argsort(codes, kind='stable').astype(np.int64)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        start = int((codes < 0).sum()) # kode -1 (NaN) terurut paling depan
+        boundaries = start + np.concatenate([[0], np.cumsum(counts)])
+        self._positions = {category: order[boundaries[i]:boundaries[i + 1]] for i, category in enumerate(self.categories)}
+
+    def positions(self, value):
+        return self._positions.get(value, np.empty(0, dtype=np.int64))
+
+
+class FilterIndex:
+    def __init__(self, df, exclude=('Status',), max_cardinality=MAX_FILTER_CARDINALITY):
+        self.n_rows = len(df)
+        self.columns = {}
+        for col in df.columns:
+            if col in exclude or not is_label_column(df[col]):
+                continue
+            column_index = ColumnIndex(df[col])
+            if len(column_index.categories) < max_cardinality:
+                self.columns[col] = column_index
+
+    def options(self, col):
+        """Daftar opsi selectbox (sudah terurut), dihitung sekali saat indeks dibangun."""
+        return [ALL_OPTION] + self.columns[col].categories
+
+    def positions(self, selections):
+        """Posisi baris yang lolos semua filter, atau None bila tidak ada filter aktif."""
+        active = [self.columns[col].positions(val) for col, val in selections.items() if val != ALL_OPTION]
+        if not active:
+            return None
+        active.sort(key=len) # mulai dari himpunan terkecil agar irisan murah
+        result = active[0]
+        for positions in active[1:]:
+            result = np.intersect1d(result, positions, assume_unique=True)
+        return result
+
+    def apply(self, df, selections):
+        """Terapkan filter; tanpa filter aktif DataFrame asli dikembalikan apa adanya (tanpa salinan)."""
+        positions = self.positions(selections)
+        return df if positions is None else df.take(positions)
@@ -0,0 +1,95 @@
+"""Instrumentasi ringan: durasi per tahap rerun dan hit/miss cache dalam penyimpanan bergulir.
+
+Durasi disimpan per tahap dalam deque berukuran tetap (jendela bergulir) sehingga p50/p95
+mencerminkan permintaan terbaru; total kumulatif disimpan terpisah untuk format Prometheus.
+"""
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+DEFAULT_WINDOW = 500
+METRIC_PREFIX = 'dropout'
+
+
+class MetricsStore:
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._durations = defaultdict(lambda: deque(maxlen=self.window))
+        self._totals = defaultdict(lambda: [0, 0.0]) # tahap -> [jumlah, total detik]
+        self._cache_events = defaultdict(int) # (cache, 'hit'/'miss') -> jumlah
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # --- Durasi tahap ---
+    def record(self, stage, seconds):
+        with self._lock:
+            self._durations[stage].append(seconds)
+            totals = self._totals[stage]
+            totals[0] += 1
+            totals[1] += seconds
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    # --- Hit/miss cache Streamlit ---
+    def mark_cache_miss(self, cache_name):
+        """Dipanggil dari dalam badan fungsi ber-cache; badan hanya berjalan saat miss."""
+        misses = getattr(self._local, 'misses', None)
+        if misses is not None:
+            misses.add(cache_name)
+
+    def cached_call(self, cache_name, fn, *args, **kwargs):
+        """Panggil fungsi st.cache_data/st.cache_resource dan catat apakah hasilnya hit atau miss."""
+        self._local.misses = set()
+        try:
+            result = fn(*args, **kwargs)
+            outcome = 'miss' if cache_name in self._local.misses else 'hit'
+        finally:
+            self._local.misses = None
+        with self._lock:
+            self._cache_events[(cache_name, outcome)] += 1
+        return result
+
+    # --- Ringkasan ---
+    def stage_summary(self):
+        with self._lock:
+            snapshot = {stage: np.asarray(values) for stage, values in self._durations.items() if values}
+            totals = {stage: tuple(values) for stage, values in self._totals.items()}
+        return [
+            {'Tahap': stage, 'p50_ms': float(np.percentile(values, 50) * 1000),
+             'p95_ms': float(np.percentile(values, 95) * 1000), 'Jumlah': totals[stage][0]}
+            for stage, values in sorted(snapshot.items())
+        ]
+
+    def cache_summary(self):
+        with self._lock:
+            events = dict(self._cache_events)
+        names = sorted({name for name, _ in events})
+        return [{'Cache': name, 'Hit': events.get((name, 'hit'), 0), 'Miss': events.get((name, 'miss'), 0)} for name in names]
+
+    def prometheus_text(self):
+        """Dump metrik dalam format teks eksposisi Prometheus."""
+        with self._lock:
+            snapshot = {stage: np.asarray(values) for stage, values in self._durations.items() if values}
+            totals = {stage: tuple(values) for stage, values in self._totals.items()}
+            events = dict(self._cache_events)
+        lines = [f'# HELP {METRIC_PREFIX}_stage_seconds Durasi tahap rerun (jendela {self.window} sampel terakhir).',
+                 f'# TYPE {METRIC_PREFIX}_stage_seconds summary']
+        for stage, values in sorted(snapshot.items()):
+            for quantile in (0.5, 0.95, 0.99):
+                lines.append(f'{METRIC_PREFIX}_stage_seconds{{stage="{stage}",quantile="{quantile}"}} {np.quantile(values, quantile):.6f}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_count{{stage="{stage}"}} {totals[stage][0]}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_sum{{stage="{stage}"}} {totals[stage][1]:.6f}')
+        lines += [f'# HELP {METRIC_PREFIX}_cache_events_total Hit/miss cache Streamlit.',
+                  f'# TYPE {METRIC_PREFIX}_cache_events_total counter']
+        for (name, outcome), count in sorted(events.items()):
+            lines.append(f'{METRIC_PREFIX}_cache_events_total{{cache="{name}",result="{outcome}"}} {count}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,73 @@
+"""Cache hasil prediksi (probabilitas & kontribusi SHAP) dengan kunci vektor fitur ternormalisasi.
+
+Kunci = hash vektor fitur yang sudah diselaraskan ke `feature_names_in_` (float64) + versi file
+model, sehingga pengiriman ulang form dengan nilai sama langsung dijawab dari memori. Eviksi
+LRU dengan batas ukuran dan TTL; penghitung hit/miss ditampilkan di sidebar.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAXSIZE = 512
+DEFAULT_TTL_SECONDS = 60 * 60
+
+
+class PredictionCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl_seconds=DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(features_df, model_version):
+        """Hash stabil dari nama kolom (urutan model) + nilai float64 + versi model."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(model_version.encode())
+        digest.update('\x1f'.join(map(str, features_df.columns)).encode())
+        values = np.ascontiguousarray(features_df.to_numpy(dtype=np.float64, na_value=np.nan))
+        digest.update(values.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry['created'] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry['value']
+
+    def put(self, key, **value):
+        with self._lock:
+            self._entries[key] = {'created': self._clock(), 'value': dict(value)}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def update(self, key, **fields):
+        """Tambahkan field (mis. SHAP yang dihitung belakangan) ke entri yang masih ada."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry['value'].update(fields)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries),
+                    'hit_rate': self.hits / total if total else 0.0}
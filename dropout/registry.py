@@ -0,0 +1,174 @@
+"""Registry model dengan hot-reload: artefak baru di `model/` dimuat tanpa restart proses.
+
+Thread pengawas memeriksa versi artefak (nama, mtime, ukuran) secara berkala. Versi baru
+dimuat di latar belakang, dipanaskan dengan batch dummy (engine inferensi) dan pembuatan
+explainer SHAP, lalu dipasang dengan satu penggantian referensi. Hanya pemanasan engine yang
+menentukan penggantian: kegagalan explainer (misalnya shap tidak terpasang) tidak menahan model baru. Pemanggil mengambil
+`registry.active` sekali per permintaan sehingga prediksi yang sedang berjalan tetap memakai
+versi lamanya dan tidak pernah menunggu proses pemuatan. Model awal tidak dipanaskan dengan
+explainer: shap baru diimpor saat penjelasan SHAP pertama kali diminta.
+
+Dengan `shared_dir`, array pohon model diterbitkan sekali ke file memori bersama
+(`dropout.sharedmem`) dan setiap proses memakai engine tanpa booster di atas file tersebut;
+model lengkap hanya dimuat saat explainer SHAP pertama kali dibutuhkan, dan ditolak bila artefak
+di disk sudah bukan versi snapshot tersebut.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from dropout.explain import SUPPORTED_MODEL_TYPES, ModelExplainer, is_tree_model
+from dropout.fastpredict import FastInferenceEngine, UnsupportedModelError, build_inference_engine
+from dropout.scoring import load_model, model_file_version, predict_with_proba, resolve_model_path
+from dropout.sharedmem import attach_or_publish, engine_from_shared, publish_engine, shared_path
+
+MODEL_POLL_SECONDS = float(os.environ.get('DROPOUT_MODEL_POLL_SECONDS', 10))
+WARMUP_ROWS = 8
+
+
+def warmup_batch(model, n_rows=WARMUP_ROWS):
+    """Batch nol dengan kolom fitur model; None bila model tidak menyimpan nama fitur."""
+    features = getattr(model, 'feature_names_in_', None)
+    if features is None:
+        return None
+    return pd.DataFrame(np.zeros((n_rows, len(features))), columns=list(features))
+
+
+class LoadedModel:
+    """Satu versi model beserta engine inferensi dan explainer SHAP (dibuat sekali, thread-safe)."""
+
+    def __init__(self, version, path, model, engine, loaded_at, model_type=None, loader=load_model):
+        self.version = version
+        self.path = path
+        self.model = model
+        self.engine = engine
+        self.loaded_at = loaded_at
+        self.model_type = model_type or type(model).__name__
+        self.loader = loader
+        self.warmup_seconds = None
+        self._explainer = None
+        self._explainer_lock = threading.Lock()
+
+    @property
+    def explainable(self):
+        return self.model_type in SUPPORTED_MODEL_TYPES
+
+    def explainer(self):
+        if self._explainer is None:
+            with self._explainer_lock:
+                if self._explainer is None:
+                    model = self.model if is_tree_model(self.model) else self._load_full_model()
+                    self._explainer = ModelExplainer(model)
+        return self._explainer
+
+    def _load_full_model(self):
+        # Mode memori bersama: self.model hanya engine array, model lengkap dimuat dari disk di sini.
+        # Versi diperiksa setelah pemuatan agar penggantian file di tengah jalan juga terdeteksi.
+        model = self.loader(self.path)
+        if model_file_version(self.path) != self.version:
+            raise RuntimeError(f"Artefak model sudah berganti dari versi {self.version}; "
+                               "penjelasan SHAP tersedia setelah registry memasang versi baru.")
+        return model
+
+    def warm_up(self, with_explainer=True):
+        """Jalankan batch dummy lewat engine (dan explainer) agar permintaan pertama tidak membayar biaya dingin.
+
+        Hanya error engine yang diteruskan; explainer yang gagal dibangun dicoba lagi saat SHAP diminta.
+        """
+        start = time.perf_counter()
+        batch = warmup_batch(self.model)
+        if batch is not None:
+            predict_with_proba(self.engine, batch)
+            if with_explainer and is_tree_model(self.model):
+                try:
+                    self.explainer().explain(batch.iloc[:1])
+                except Exception:
+                    pass # shap tidak terpasang/explainer gagal: model tetap layak dipasang untuk prediksi
+        self.warmup_seconds = time.perf_counter() - start
+        return self
+
+
+class ModelRegistry:
+    def __init__(self, model_path=None, poll_interval=MODEL_POLL_SECONDS, loader=load_model, shared_dir=None):
+        self.model_path = model_path # None: .joblib bila ada, selain itu .pkl
+        self.poll_interval = poll_interval
+        self.loader = loader
+        self.shared_dir = shared_dir
+        self.active = None
+        self.last_error = None
+        self._failed_version = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def _build(self, version):
+        path = resolve_model_path(self.model_path)
+        if self.shared_dir:
+            try:
+                shared = attach_or_publish(shared_path(self.shared_dir, 'model', version),
+                                           lambda shared_file: self._publish(shared_file, path, version), version)
+                engine = engine_from_shared(shared)
+                return LoadedModel(version, path, engine, engine, datetime.now(),
+                                   model_type=shared.meta['model_type'], loader=self.loader)
+            except UnsupportedModelError:
+                pass # model tidak dapat diratakan menjadi array pohon: muat per proses seperti biasa
+        model = self.loader(path)
+        return LoadedModel(version, path, model, build_inference_engine(model), datetime.now(), loader=self.loader)
+
+    def _publish(self, shared_file, path, version):
+        model = self.loader(path)
+        engine = build_inference_engine(model)
+        if not isinstance(engine, FastInferenceEngine):
+            raise UnsupportedModelError(f"Model {type(model).__name__} tidak dapat dibagikan sebagai array pohon.")
+        publish_engine(shared_file, engine, version, type(model).__name__)
+
+    def load(self):
+        """Pemuatan awal (sinkron); explainer dibangun saat SHAP pertama kali dibutuhkan agar shap tidak diimpor di cold start."""
+        with self._reload_lock:
+            version = model_file_version(self.model_path)
+            if not version:
+                self.last_error = FileNotFoundError(resolve_model_path(self.model_path))
+                return None
+            try:
+                self.active = self._build(version).warm_up(with_explainer=False)
+                self.last_error = None
+            except Exception as e:
+                self.last_error, self._failed_version = e, version
+            return self.active
+
+    def reload_if_changed(self):
+        """Muat & panaskan versi baru bila artefak berubah; True bila model aktif diganti."""
+        version = model_file_version(self.model_path)
+        active = self.active
+        if not version or version == self._failed_version or (active is not None and version == active.version):
+            return False
+        if not self._reload_lock.acquire(blocking=False):
+            return False # pemuatan lain sedang berjalan
+        try:
+            candidate = self._build(version).warm_up()
+            self.active = candidate # penggantian atomik; pembaca lama tetap memegang versi sebelumnya
+            self.last_error = None
+            return True
+        except Exception as e:
+            # Artefak rusak/setengah tertulis: versi lama tetap aktif, dicoba lagi saat file berubah
+            self.last_error, self._failed_version = e, version
+            return False
+        finally:
+            self._reload_lock.release()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.reload_if_changed()
+
+    def start(self):
+        if self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, name='model-registry-watcher', daemon=True)
+            self._watcher.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,128 @@
+"""Rencana dtype berbasis skema untuk data mahasiswa (dashboard dan input skoring).
+
+Kode kategori (Course, Application_mode, kualifikasi/pekerjaan orang tua, dll.) disimpan
+sebagai int8/int16, flag biner dan jumlah SKS sebagai int8, nilai & indikator makro sebagai
+float32, dan `Status` sebagai categorical. Pada `data/data_mapped.csv` kolom kode berisi label
+teks sehingga otomatis menjadi categorical. Setiap kolom divalidasi (NaN, bukan bilangan bulat,
+di luar rentang); kolom yang tidak lolos dibiarkan dengan dtype aslinya dan dilaporkan.
+"""
+import numpy as np
+import pandas as pd
+
+_INT8_COLUMNS = [
+    'Marital_status', 'Application_mode', 'Application_order', 'Daytime_evening_attendance',
+    'Previous_qualification', 'Nacionality', 'Mothers_qualification', 'Fathers_qualification',
+    'Displaced', 'Educational_special_needs', 'Debtor', 'Tuition_fees_up_to_date', 'Gender',
+    'Scholarship_holder', 'International', 'Age_at_enrollment',
+    'Curricular_units_1st_sem_credited', 'Curricular_units_1st_sem_enrolled',
+    'Curricular_units_1st_sem_evaluations', 'Curricular_units_1st_sem_approved',
+    'Curricular_units_1st_sem_without_evaluations',
+    'Curricular_units_2nd_sem_credited', 'Curricular_units_2nd_sem_enrolled',
+    'Curricular_units_2nd_sem_evaluations', 'Curricular_units_2nd_sem_approved',
+    'Curricular_units_2nd_sem_without_evaluations',
+]
+_INT16_COLUMNS = ['Course', 'Mothers_occupation', 'Fathers_occupation']
+_FLOAT_COLUMNS = [
+    'Previous_qualification_grade', 'Admission_grade', 'Curricular_units_1st_sem_grade',
+    'Curricular_units_2nd_sem_grade', 'Unemployment_rate', 'Inflation_rate', 'GDP',
+]
+
+DTYPE_PLAN = {
+    **{col: 'int8' for col in _INT8_COLUMNS},
+    **{col: 'int16' for col in _INT16_COLUMNS},
+    **{col: 'float' for col in _FLOAT_COLUMNS}, # float32 di dashboard, float64 untuk skoring
+    'Status': 'category',
+}
+
+
+class SchemaError(ValueError):
+    def __init__(self, issues):
+        super().__init__("Data tidak sesuai skema dtype: " + "; ".join(issues))
+        self.issues = issues
+
+
+def _format_bytes(n_bytes):
+    return f"{n_bytes / 1024 ** 2:.1f} MB"
+
+
+class DtypeReport:
+    def __init__(self, bytes_before, bytes_after, issues=()):
+        self.bytes_before = int(bytes_before)
+        self.bytes_after = int(bytes_after)
+        self.issues = list(issues)
+
+    @property
+    def saved_bytes(self):
+        return self.bytes_before - self.bytes_after
+
+    def summary(self):
+        ratio = self.bytes_before / self.bytes_after if self.bytes_after else float('nan')
+        return (f"Memori data {_format_bytes(self.bytes_before)} → {_format_bytes(self.bytes_after)} "
+                f"(hemat {_format_bytes(self.saved_bytes)}, {ratio:.1f}x lebih kecil)")
+
+
+def _is_numeric(series):
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def _plan_column(series, target, float_dtype):
+    """Kembalikan (series baru, masalah atau None) untuk satu kolom."""
+    if target == 'category':
+        return series.astype('category'), None
+    if not _is_numeric(series):
+        if target == 'float':
+            return series, f"{series.name}: bukan numerik"
+        return series.astype('category'), None # kode yang sudah dipetakan ke label teks
+    if target == 'float':
+        return series.astype(float_dtype), None
+    info = np.iinfo(target)
+    values = series.to_numpy()
+    if series.isna().any():
+        return series, f"{series.name}: mengandung nilai kosong"
+    if values.dtype.kind == 'f' and not np.array_equal(values, np.round(values)):
+        return series, f"{series.name}: bukan bilangan bulat"
+    if len(values) and (values.min() < info.min or values.max() > info.max):
+        return series, f"{series.name}: di luar rentang {target} [{info.min}, {info.max}]"
+    return series.astype(target), None
+
+
+def apply_dtype_plan(df, plan=DTYPE_PLAN, float_dtype=np.float32, strict=False):
+    """Terapkan rencana dtype pada kolom yang ada (nama kolom sudah dinormalisasi).
+
+    Mengembalikan (DataFrame, DtypeReport). Dengan `strict=True`, pelanggaran skema memunculkan
+    SchemaError; tanpa itu kolom yang bermasalah dibiarkan dan dicatat di `report.issues`.
+    """
+    bytes_before = df.memory_usage(deep=True, index=False).sum()
+    converted, issues = {}, []
+    for col in df.columns:
+        if col not in plan:
+            continue
+        series, issue = _plan_column(df[col], plan[col], float_dtype)
+        if issue:
+            issues.append(issue)
+        elif series.dtype != df[col].dtype:
+            converted[col] = series
+    if strict and issues:
+        raise SchemaError(issues)
+    if converted:
+        df = df.assign(**converted)
+    return df, DtypeReport(bytes_before, df.memory_usage(deep=True, index=False).sum(), issues)
+
+
+def baseline_nbytes(df):
+    """Ukuran frame bila dimuat tanpa rencana dtype (int64/float64 dan string objek Python)."""
+    total = 0
+    for col in df.columns:
+        series = df[col]
+        if series.dtype.name in ('category', 'object'):
+            total += series.astype(object).memory_usage(deep=True, index=False)
+        elif _is_numeric(series):
+            total += 8 * len(series)
+        else:
+            total += series.memory_usage(deep=True, index=False)
+    return total
+
+
+def memory_report(df):
+    """Penghematan memori frame yang sudah bertipe dibanding pemuatan pandas default."""
+    return DtypeReport(baseline_nbytes(df), df.memory_usage(deep=True, index=False).sum())
@@ -0,0 +1,303 @@
+"""Skoring mahasiswa tanpa Streamlit: fitur turunan, penyelarasan fitur model, dan CLI batch.
+
+Contoh pemakaian::
+
+    python -m dropout.scoring data/data.csv -o hasil_prediksi.csv
+    cat kohort.parquet | python -m dropout.scoring - --input-format parquet -o hasil.parquet
+"""
+import argparse
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from dropout.schema import SchemaError, apply_dtype_plan
+
+# --- Konfigurasi Path & Kelas ---
+MODEL_PATH_JOBLIB = 'model/tuned_lightgbm_model.joblib'
+MODEL_PATH_PKL = 'model/tuned_lightgbm_model.pkl'
+
+CLASS_MAPPING = {0: 'Graduate/Enrolled', 1: 'Dropout'}
+DROPOUT_CLASS_CODE = 1
+DEFAULT_CHUNK_SIZE = 10_000 # Jumlah baris per panggilan predict_proba
+
+# Kolom mentah yang dibutuhkan add_derived_features
+DERIVED_FEATURE_INPUTS = [
+    'Curricular_units_1st_sem_enrolled', 'Curricular_units_2nd_sem_enrolled',
+    'Curricular_units_1st_sem_approved', 'Curricular_units_2nd_sem_approved',
+    'Curricular_units_1st_sem_grade', 'Curricular_units_2nd_sem_grade',
+]
+DERIVED_FEATURES = ['pass_ratio_sem1', 'pass_ratio_sem2', 'total_enrolled', 'average_grade']
+
+
+class MissingFeaturesError(KeyError):
+    """Fitur yang diharapkan model tidak ada di data input."""
+
+    def __init__(self, missing):
+        self.missing = set(missing)
+        super().__init__(f"Fitur berikut diharapkan oleh model tetapi tidak ada di data input: {sorted(self.missing)}")
+
+
+class NonNumericFeaturesError(ValueError):
+    """Fitur model berisi teks (mis. label hasil pemetaan seperti data_mapped.csv), bukan kode numerik."""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        super().__init__(f"Fitur berikut harus berisi kode numerik tetapi berisi teks: {self.columns}")
+
+
+def resolve_model_path(model_path=None):
+    """Path model yang akan dimuat: path eksplisit, atau .joblib bila ada, selain itu .pkl."""
+    if model_path is not None:
+        return model_path
+    return MODEL_PATH_JOBLIB if os.path.exists(MODEL_PATH_JOBLIB) else MODEL_PATH_PKL
+
+
+def model_file_version(model_path=None):
+    """Versi artefak model (nama, mtime, ukuran) untuk kunci cache; string kosong bila file tidak ada."""
+    model_path = resolve_model_path(model_path)
+    if not os.path.exists(model_path):
+        return ""
+    stat = os.stat(model_path)
+    return f"{os.path.basename(model_path)}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def load_model(model_path=None):
+    """Muat model dari path yang diberikan, atau .joblib lalu .pkl sebagai cadangan."""
+    import joblib
+    if model_path is not None:
+        return joblib.load(model_path)
+    try:
+        return joblib.load(MODEL_PATH_JOBLIB)
+    except FileNotFoundError:
+        return joblib.load(MODEL_PATH_PKL)
+
+
+def normalize_column_names(columns):
+    return pd.Index(columns).str.strip().str.replace(' ', '_').str.replace(r'[\(\)]', '', regex=True)
+
+
+def add_derived_features(df):
+    """Hitung pass_ratio_sem1/2, total_enrolled dan average_grade secara vektor (tanpa loop per baris)."""
+    enrolled_1 = df['Curricular_units_1st_sem_enrolled'].astype(float)
+    enrolled_2 = df['Curricular_units_2nd_sem_enrolled'].astype(float)
+    approved_1 = df['Curricular_units_1st_sem_approved'].astype(float)
+    approved_2 = df['Curricular_units_2nd_sem_approved'].astype(float)
+    df = df.assign(
+        pass_ratio_sem1=np.where(enrolled_1 > 0, approved_1 / enrolled_1.where(enrolled_1 > 0, 1.0), 0.0),
+        pass_ratio_sem2=np.where(enrolled_2 > 0, approved_2 / enrolled_2.where(enrolled_2 > 0, 1.0), 0.0),
+        total_enrolled=enrolled_1 + enrolled_2,
+    )
+    grade_1 = df['Curricular_units_1st_sem_grade'].astype(float).where(enrolled_1 > 0)
+    grade_2 = df['Curricular_units_2nd_sem_grade'].astype(float).where(enrolled_2 > 0)
+    semesters_with_grades = grade_1.notna().astype(int) + grade_2.notna().astype(int)
+    grades_sum = grade_1.fillna(0.0) + grade_2.fillna(0.0)
+    df['average_grade'] = np.where(semesters_with_grades > 0, grades_sum / semesters_with_grades.clip(lower=1), 0.0)
+    return df
+
+
+def align_features(df, model):
+    """Urutkan kolom sesuai `model.feature_names_in_`; tanpa atribut tersebut data dikembalikan apa adanya."""
+    expected_features = getattr(model, 'feature_names_in_', None)
+    if expected_features is None:
+        return df
+    missing = set(expected_features) - set(df.columns)
+    if missing:
+        raise MissingFeaturesError(missing)
+    return df[list(expected_features)]
+
+
+def required_input_columns(model):
+    """Kolom mentah yang harus ada di input agar fitur model (termasuk fitur turunan) dapat dibentuk."""
+    expected_features = getattr(model, 'feature_names_in_', None)
+    raw_features = [] if expected_features is None else [f for f in expected_features if f not in DERIVED_FEATURES]
+    return sorted(set(raw_features) | set(DERIVED_FEATURE_INPUTS))
+
+
+def derived_frame(df, strict=False):
+    """Normalisasi nama kolom dan dtype, lalu tambah fitur turunan (semua kolom input tetap ada).
+
+    Dengan `strict=True`, kolom yang melanggar rencana dtype (kode di luar rentang, teks pada kolom
+    kode) memunculkan SchemaError alih-alih diteruskan apa adanya.
+    """
+    df = df.copy(deep=False)
+    df.columns = normalize_column_names(df.columns)
+    df, _ = apply_dtype_plan(df, float_dtype=np.float64, strict=strict) # kode int8/int16; nilai tetap float64 demi paritas threshold
+    return add_derived_features(df)
+
+
+def model_features(frame, model):
+    """Selaraskan hasil `derived_frame` dengan model dan pastikan semua fitur berisi kode numerik."""
+    features = align_features(frame, model)
+    non_numeric = [col for col in features.columns if not pd.api.types.is_numeric_dtype(features[col])]
+    if non_numeric:
+        raise NonNumericFeaturesError(non_numeric)
+    return features
+
+
+def prepare_features(df, model, strict=False):
+    """Normalisasi nama kolom, tambah fitur turunan, lalu selaraskan dengan model."""
+    return model_features(derived_frame(df, strict=strict), model)
+
+
+def class_label(code):
+    return CLASS_MAPPING.get(code, f"Kelas {code} (Tidak Terdefinisi)")
+
+
+def proba_to_result(model, proba, index=None):
+    """Bentuk tabel hasil dari matriks probabilitas; label diturunkan dari argmax (tanpa predict terpisah)."""
+    classes = np.asarray(getattr(model, 'classes_', np.arange(proba.shape[1])))
+    predicted_codes = classes[proba.argmax(axis=1)]
+    result = pd.DataFrame(proba, columns=[f"prob_kelas_{c}" for c in classes], index=index)
+    result['prediksi_kode'] = predicted_codes
+    result['prediksi_label'] = [class_label(c) for c in predicted_codes]
+    return result
+
+
+def predict_with_proba(model, features_df):
+    """Label dan probabilitas dari satu traversal model (label = kelas dengan probabilitas terbesar)."""
+    if hasattr(model, 'predict_with_proba'):
+        return model.predict_with_proba(features_df)
+    proba = model.predict_proba(features_df)
+    classes = np.asarray(getattr(model, 'classes_', np.arange(proba.shape[1])))
+    return classes[proba.argmax(axis=1)], proba
+
+
+def iter_batch_predictions(model, features_df, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Panggil predict_proba per potongan baris yang sudah diselaraskan; hasilkan (offset, hasil)."""
+    for start in range(0, len(features_df), chunk_size):
+        chunk = features_df.iloc[start:start + chunk_size]
+        yield start, proba_to_result(model, model.predict_proba(chunk), index=chunk.index)
+
+
+def sniff_separator(first_line):
+    return ';' if first_line.count(';') > first_line.count(',') else ','
+
+
+def _detect_format(path, explicit):
+    if explicit:
+        return explicit
+    if path not in (None, '-') and os.path.splitext(path)[1].lower() in ('.parquet', '.pq'):
+        return 'parquet'
+    return 'csv'
+
+
+def iter_input_chunks(source, input_format='csv', chunk_size=DEFAULT_CHUNK_SIZE, sep=None):
+    """Baca CSV/Parquet dari path atau stdin ('-') per potongan agar memori tetap terbatas."""
+    if input_format == 'parquet':
+        import pyarrow.parquet as pq
+        # Parquet membutuhkan footer di akhir file, sehingga stdin harus ditampung dulu
+        handle = io.BytesIO(sys.stdin.buffer.read()) if source == '-' else source
+        parquet_file = pq.ParquetFile(handle)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+        return
+
+    handle = io.BufferedReader(sys.stdin.buffer) if source == '-' else open(source, 'rb')
+    try:
+        if sep is None:
+            first_line = handle.peek(4096)[:4096].decode('utf-8-sig', errors='ignore').splitlines()
+            sep = sniff_separator(first_line[0] if first_line else '')
+        for chunk in pd.read_csv(handle, sep=sep, encoding='utf-8-sig', chunksize=chunk_size):
+            yield chunk
+    finally:
+        if source != '-':
+            handle.close()
+
+
+class ResultWriter:
+    """Tulis hasil skoring per potongan ke CSV atau Parquet (path atau stdout)."""
+
+    def __init__(self, destination='-', output_format='csv'):
+        self.destination = destination
+        self.output_format = output_format
+        self._handle = None
+        self._parquet_writer = None
+
+    def write(self, frame):
+        if self.output_format == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet_writer is None:
+                sink = sys.stdout.buffer if self.destination == '-' else self.destination
+                self._parquet_writer = pq.ParquetWriter(sink, table.schema)
+            elif not table.schema.equals(self._parquet_writer.schema):
+                # Skema dikunci oleh potongan pertama; dtype hasil inferensi potongan lain (mis. int -> float karena NaN) disamakan
+                table = table.cast(self._parquet_writer.schema)
+            self._parquet_writer.write_table(table)
+            return
+        write_header = self._handle is None
+        if self._handle is None:
+            self._handle = sys.stdout if self.destination == '-' else open(self.destination, 'w', encoding='utf-8', newline='')
+        frame.to_csv(self._handle, index=False, header=write_header)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        if self._handle is not None and self._handle is not sys.stdout:
+            self._handle.close()
+        elif self._handle is sys.stdout:
+            sys.stdout.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def score_stream(model, chunks, writer, keep_input_columns=True, strict=False):
+    """Skor setiap potongan input dan langsung tulis hasilnya; kembalikan jumlah baris yang diskor."""
+    total_rows = 0
+    for chunk in chunks:
+        features = prepare_features(chunk, model, strict=strict)
+        result = proba_to_result(model, model.predict_proba(features), index=chunk.index)
+        writer.write(pd.concat([chunk, result], axis=1) if keep_input_columns else result)
+        total_rows += len(chunk)
+    return total_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Skoring batch risiko dropout mahasiswa tanpa Streamlit.")
+    parser.add_argument('input', help="File CSV/Parquet input, atau '-' untuk stdin")
+    parser.add_argument('-o', '--output', default='-', help="File hasil (CSV/Parquet), default stdout")
+    parser.add_argument('--input-format', choices=['csv', 'parquet'], help="Default: ditebak dari ekstensi file")
+    parser.add_argument('--output-format', choices=['csv', 'parquet'], help="Default: ditebak dari ekstensi file")
+    parser.add_argument('--model', help=f"Path model (default {MODEL_PATH_JOBLIB}, cadangan {MODEL_PATH_PKL})")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Jumlah baris per potongan")
+    parser.add_argument('--sep', help="Pemisah CSV input (default: dideteksi otomatis)")
+    parser.add_argument('--only-predictions', action='store_true', help="Jangan sertakan kolom input di file hasil")
+    parser.add_argument('--engine', choices=['native', 'sklearn'], default='native',
+                        help="native: Booster.predict langsung pada array NumPy; sklearn: wrapper LGBMClassifier")
+    parser.add_argument('--strict-schema', action='store_true',
+                        help="Tolak input yang melanggar skema dtype (mis. kode di luar rentang) alih-alih menskornya apa adanya")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.model)
+    if args.engine == 'native':
+        from dropout.fastpredict import build_inference_engine
+        model = build_inference_engine(model)
+    input_format = _detect_format(args.input, args.input_format)
+    output_format = _detect_format(args.output, args.output_format)
+    chunks = iter_input_chunks(args.input, input_format, chunk_size=args.chunk_size, sep=args.sep)
+    try:
+        with ResultWriter(args.output, output_format) as writer:
+            total_rows = score_stream(model, chunks, writer, keep_input_columns=not args.only_predictions,
+                                      strict=args.strict_schema)
+    except MissingFeaturesError as e:
+        parser.exit(2, f"ERROR: {e.args[0]}\n")
+    except KeyError as e:
+        parser.exit(2, f"ERROR: Kolom wajib tidak ditemukan di data input: {e}\n")
+    except (NonNumericFeaturesError, SchemaError) as e:
+        parser.exit(2, f"ERROR: {e}\n")
+    except ValueError as e:
+        parser.exit(2, f"ERROR: Data input tidak dapat diskor: {e}\n")
+    print(f"{total_rows} baris diskor.", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
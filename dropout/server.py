@@ -0,0 +1,287 @@
+"""Layanan HTTP lokal (asyncio) untuk skoring, dengan micro-batching permintaan.
+
+Permintaan satu mahasiswa yang datang bersamaan digabung menjadi satu batch (maksimal
+`--max-batch` baris atau `--max-wait-ms` milidetik), lalu diskor di pool proses pekerja yang
+masing-masing memuat model sekali. Memakai fitur turunan dan penyelarasan dari dropout.scoring::
+
+    python -m dropout.server --port 8502 --max-wait-ms 5 --workers 4
+
+    curl -X POST localhost:8502/predict -d '{"Curricular_units_2nd_sem_approved": 5, ...}'
+
+Endpoint: `POST /predict` (objek JSON satu mahasiswa atau list objek), `GET /health`.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+
+import pandas as pd
+
+from dropout.scoring import (load_model, model_file_version, predict_with_proba, prepare_features,
+                             class_label, required_input_columns, resolve_model_path)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8502
+DEFAULT_MAX_WAIT_MS = 5.0
+DEFAULT_MAX_BATCH = 256
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class RequestError(Exception):
+    """Permintaan HTTP yang tidak dapat dibaca; dijawab dengan `status` lalu koneksi ditutup."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# --- Sisi pekerja (dijalankan di tiap proses pool) ---
+_worker_model = None
+
+
+def _init_worker(model_path):
+    global _worker_model
+    from dropout.fastpredict import build_inference_engine
+    _worker_model = build_inference_engine(load_model(model_path))
+
+
+def _score_records(records):
+    """Skor list dict input dalam satu panggilan model; dipanggil di proses pekerja."""
+    features = prepare_features(pd.DataFrame.from_records(records), _worker_model)
+    labels, proba = predict_with_proba(_worker_model, features)
+    classes = [c.item() if hasattr(c, 'item') else c for c in _worker_model.classes_]
+    return [
+        {'probabilities': {str(c): float(p) for c, p in zip(classes, row)},
+         'prediksi_kode': label.item() if hasattr(label, 'item') else label,
+         'prediksi_label': class_label(label)}
+        for label, row in zip(labels, proba)
+    ]
+
+
+class MicroBatcher:
+    """Kumpulkan permintaan bersamaan menjadi batch berdasarkan ukuran maksimum atau waktu tunggu."""
+
+    def __init__(self, executor, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue()
+        self.batches_scored = 0
+        self.rows_scored = 0
+        self._task = None
+        self._scoring_tasks = set() # referensi kuat agar task skoring tidak di-GC di tengah jalan
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def submit(self, records):
+        """Masukkan satu atau beberapa record; hasil dikembalikan setelah batch-nya selesai diskor."""
+        loop = asyncio.get_running_loop()
+        futures = []
+        for record in records:
+            future = loop.create_future()
+            await self.queue.put((record, future))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Batch berikutnya dapat dikumpulkan selagi batch ini diskor di pool pekerja
+            task = asyncio.create_task(self._score(batch))
+            self._scoring_tasks.add(task)
+            task.add_done_callback(self._scoring_tasks.discard)
+
+    async def _score(self, batch):
+        loop = asyncio.get_running_loop()
+        records = [record for record, _ in batch]
+        try:
+            results = await loop.run_in_executor(self.executor, _score_records, records)
+        except Exception as e:
+            if len(batch) > 1:
+                # Satu record bermasalah tidak boleh menggagalkan record lain di batch yang sama: skor ulang per baris
+                await asyncio.gather(*(self._score([item]) for item in batch))
+                return
+            _, future = batch[0]
+            if not future.done():
+                future.set_exception(e)
+            return
+        self.batches_scored += 1
+        self.rows_scored += len(records)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def _numeric_record(record, columns):
+    """Ambil kolom wajib sebagai float (null menjadi NaN); kembalikan (record, kolom yang tidak valid)."""
+    converted, invalid = {}, []
+    for col in columns:
+        value = record[col]
+        try:
+            converted[col] = float('nan') if value is None else float(value)
+        except (TypeError, ValueError):
+            invalid.append(col)
+    return converted, invalid
+
+
+class ScoringServer:
+    def __init__(self, batcher, required_columns, model_version):
+        self.batcher = batcher
+        self.required_columns = required_columns
+        self.model_version = model_version
+        self.started = time.time()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except RequestError as e:
+                    self._write_response(writer, e.status, {'error': str(e)}, keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, payload = await self._dispatch(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader):
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+        lines = head.decode('latin-1').split('\r\n')
+        request_line = lines[0].split(' ')
+        if len(request_line) != 3:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Baris permintaan tidak valid: {lines[0][:100]!r}")
+        method, path, _ = request_line
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Content-Length bukan bilangan bulat")
+        if length < 0:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Content-Length negatif")
+        if length > MAX_BODY_BYTES:
+            # Sisa body tidak dibaca, jadi koneksi ditutup agar tidak terbaca sebagai permintaan berikutnya
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Body melebihi {MAX_BODY_BYTES} byte")
+        body = await reader.readexactly(length) if length else b''
+        return method, path, headers, body
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body
+        )
+
+    async def _dispatch(self, method, path, body):
+        if method == 'GET' and path == '/health':
+            return HTTPStatus.OK, {'status': 'ok', 'model_version': self.model_version,
+                                   'uptime_s': round(time.time() - self.started, 1),
+                                   'batches_scored': self.batcher.batches_scored,
+                                   'rows_scored': self.batcher.rows_scored}
+        if path != '/predict':
+            return HTTPStatus.NOT_FOUND, {'error': f"Endpoint {path} tidak dikenal"}
+        if method != 'POST':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': "Gunakan POST"}
+        try:
+            payload = json.loads(body or b'null')
+        except json.JSONDecodeError as e:
+            return HTTPStatus.BAD_REQUEST, {'error': f"JSON tidak valid: {e}"}
+        records = payload if isinstance(payload, list) else [payload]
+        if not records or not all(isinstance(record, dict) for record in records):
+            return HTTPStatus.BAD_REQUEST, {'error': "Body harus objek JSON atau list objek JSON"}
+        numeric_records = []
+        for i, record in enumerate(records):
+            missing = [col for col in self.required_columns if col not in record]
+            if missing:
+                return HTTPStatus.BAD_REQUEST, {'error': f"Record {i}: kolom wajib tidak ada", 'missing': missing}
+            numeric_record, invalid = _numeric_record(record, self.required_columns)
+            if invalid:
+                return HTTPStatus.BAD_REQUEST, {'error': f"Record {i}: nilai bukan numerik", 'invalid': invalid}
+            numeric_records.append(numeric_record)
+        try:
+            predictions = await self.batcher.submit(numeric_records)
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"Gagal melakukan prediksi: {e}"}
+        return HTTPStatus.OK, {'model_version': self.model_version, 'predictions': predictions}
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, model_path=None, workers=None,
+                max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+    model_path = resolve_model_path(model_path)
+    required_columns = required_input_columns(load_model(model_path))
+    workers = os.cpu_count() if workers is None else workers
+    if workers > 0:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_path,))
+    else:
+        _init_worker(model_path) # mode satu proses: skor di thread agar event loop tidak terblokir
+        executor = ThreadPoolExecutor(max_workers=1)
+    batcher = MicroBatcher(executor, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    batcher.start()
+    app = ScoringServer(batcher, required_columns, model_file_version(model_path))
+    server = await asyncio.start_server(app.handle_connection, host, port)
+    print(f"Layanan skoring berjalan di http://{host}:{port} ({workers} pekerja, "
+          f"batch <= {max_batch}, tunggu <= {max_wait_ms} ms)", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+        executor.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan HTTP skoring dropout dengan micro-batching.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--model', help="Path model (default model/tuned_lightgbm_model.joblib)")
+    parser.add_argument('--workers', type=int, help="Jumlah proses pekerja (default: jumlah core; 0 = satu proses)")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help="Ukuran batch maksimum")
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="Waktu tunggu maksimum untuk mengisi batch (ms)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.model, args.workers, args.max_batch, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Model dan data bersama antar proses Streamlit melalui file memory-map (zero-copy).
+
+Array pohon model (`FlatTreeEnsemble.arrays()`) dan kolom dataset bertipe ditulis sekali ke
+file biner di direktori bersama (mis. `/dev/shm/dropout`). Proses lain cukup me-`mmap` file
+tersebut: array NumPy dan kolom DataFrame menunjuk langsung ke halaman page cache yang sama,
+sehingga memori tidak bertambah per worker. Nama file memuat versi model/data, jadi artefak
+baru otomatis diterbitkan ke file baru; file versi sumber yang lebih lama kemudian dibersihkan.
+
+Format file: `MAGIC`, panjang header (uint64), header JSON (metadata & offset array), lalu
+blok array mentah yang disejajarkan ke `ALIGNMENT` byte.
+"""
+import json
+import mmap
+import os
+import re
+import struct
+
+import numpy as np
+import pandas as pd
+
+SHARED_DIR = os.environ.get('DROPOUT_SHARED_DIR') # mode memori bersama aktif bila diisi
+MAGIC = b'DRPSHM01'
+ALIGNMENT = 64
+
+
+def shared_path(shared_dir, kind, version):
+    """Path file bersama untuk satu jenis artefak (`model`/`data`) dan versinya."""
+    return os.path.join(shared_dir, f"{kind}.{re.sub(r'[^A-Za-z0-9._-]', '_', version)}.bin")
+
+
+def write_shared_file(path, arrays, meta):
+    """Tulis array + metadata secara atomik (file sementara lalu os.replace)."""
+    entries, offset = {}, 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        entries[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += array.nbytes
+    header = json.dumps({'meta': meta, 'arrays': entries}).encode('utf-8')
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + struct.pack('<Q', len(header)) + header)
+        for name, array in arrays.items():
+            f.seek(data_start + entries[name]['offset'])
+            f.write(np.ascontiguousarray(array).tobytes())
+    os.replace(tmp_path, path)
+
+
+class SharedFile:
+    """File bersama yang di-mmap read-only; `arrays` berisi view NumPy tanpa salinan."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} bukan file memori bersama dropout.")
+        (header_len,) = struct.unpack_from('<Q', self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        header = json.loads(self._mmap[header_start:header_start + header_len])
+        data_start = -(-(header_start + header_len) // ALIGNMENT) * ALIGNMENT
+        self.path = path
+        self.meta = header['meta']
+        self.arrays = {}
+        for name, entry in header['arrays'].items():
+            dtype = np.dtype(entry['dtype'])
+            count = int(np.prod(entry['shape'], dtype=np.int64))
+            self.arrays[name] = np.frombuffer(self._mmap, dtype=dtype, count=count,
+                                              offset=data_start + entry['offset']).reshape(entry['shape'])
+
+
+def version_mtime_ns(version):
+    """mtime sumber (ns) dari versi `model_file_version`/`dataset_version` (`...:mtime_ns:ukuran`), atau None."""
+    try:
+        return int(version.rsplit(':', 2)[-2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def remove_stale(path):
+    """Hapus file jenis yang sama dari versi sumber yang lebih lama daripada `path`.
+
+    Waktu modifikasi file bersama diset ke mtime artefak sumbernya, sehingga saat rollout worker
+    yang masih memakai versi lama tidak menghapus file versi baru (dan sebaliknya tidak saling
+    menerbitkan ulang). Proses yang masih me-mmap file yang dihapus tidak terganggu.
+    """
+    directory, name = os.path.split(path)
+    kind = name.split('.', 1)[0]
+    published_mtime = os.stat(path).st_mtime_ns
+    for other in os.listdir(directory or '.'):
+        if other != name and other.startswith(f"{kind}.") and other.endswith('.bin'):
+            other_path = os.path.join(directory, other)
+            try:
+                if os.stat(other_path).st_mtime_ns < published_mtime:
+                    os.remove(other_path)
+            except OSError:
+                pass
+
+
+def attach_or_publish(path, publish, source_version=None):
+    """Attach ke file bersama; proses pertama yang tidak menemukannya memanggil `publish(path)`.
+
+    Dengan `source_version`, file yang baru diterbitkan diberi mtime artefak sumber lalu file
+    versi yang lebih lama dibersihkan; tanpa versi sumber tidak ada file yang dihapus.
+    """
+    if not os.path.exists(path):
+        publish(path)
+        source_mtime = version_mtime_ns(source_version)
+        if source_mtime is not None:
+            os.utime(path, ns=(source_mtime, source_mtime))
+            remove_stale(path)
+    return SharedFile(path)
+
+
+# --- Model: array pohon FlatTreeEnsemble + metadata engine ---
+def publish_engine(path, engine, model_version, model_type):
+    ensemble = engine.ensemble
+    meta = {'kind': 'model', 'version': model_version, 'model_type': model_type,
+            'num_class': ensemble.num_class, 'max_depth': ensemble.max_depth, 'objective': ensemble.objective,
+            'classes': engine.classes_.tolist(), 'feature_names': engine.feature_names_in_.tolist(),
+            'dtype': np.dtype(engine.dtype).str}
+    write_shared_file(path, ensemble.arrays(), meta)
+
+
+def engine_from_shared(shared):
+    """FastInferenceEngine tanpa booster di atas array pohon yang di-mmap."""
+    from dropout.fastpredict import FastInferenceEngine, FlatTreeEnsemble
+    meta = shared.meta
+    ensemble = FlatTreeEnsemble(shared.arrays, meta['num_class'], meta['max_depth'], meta['objective'])
+    return FastInferenceEngine(ensemble, meta['classes'], meta['feature_names'], dtype=np.dtype(meta['dtype']))
+
+
+# --- Dataset: kolom numerik apa adanya, kolom label sebagai kode + daftar kategori ---
+def publish_frame(path, df, data_version):
+    arrays, columns = {}, []
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        key = f"col{i}"
+        if series.dtype.name in ('object', 'category'):
+            categorical = series.astype('category')
+            arrays[key] = categorical.cat.codes.to_numpy()
+            columns.append({'name': col, 'key': key, 'categories': categorical.cat.categories.tolist(),
+                            'ordered': bool(categorical.cat.ordered)})
+        else:
+            arrays[key] = series.to_numpy()
+            columns.append({'name': col, 'key': key})
+    write_shared_file(path, arrays, {'kind': 'data', 'version': data_version, 'n_rows': len(df), 'columns': columns})
+
+
+def frame_from_shared(shared):
+    """DataFrame yang kolomnya menunjuk langsung ke memori bersama (read-only, tanpa konsolidasi blok)."""
+    data = {}
+    for column in shared.meta['columns']:
+        values = shared.arrays[column['key']]
+        if 'categories' in column:
+            dtype = pd.CategoricalDtype(column['categories'], ordered=column['ordered'])
+            data[column['name']] = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+        else:
+            data[column['name']] = values
+    return pd.DataFrame(data, copy=False)
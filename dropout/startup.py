@@ -0,0 +1,74 @@
+"""Pengukuran biaya impor modul untuk menjaga waktu cold start aplikasi.
+
+`timed_import` dipakai app.py untuk memuat library berat secara malas sambil mencatat
+biaya impor pertamanya. CLI mengukur biaya impor dingin tiap modul di interpreter baru::
+
+    python -m dropout.startup
+    python -m dropout.startup --json shap seaborn
+"""
+import argparse
+import importlib
+import json
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ['streamlit', 'pandas', 'numpy', 'joblib', 'plotly.express', 'matplotlib.pyplot', 'seaborn', 'shap']
+
+# Biaya impor pertama (detik) di proses ini, diisi oleh timed_import
+IMPORT_TIMES = {}
+
+
+def timed_import(module_name):
+    """Impor modul dan catat durasinya bila modul belum pernah dimuat di proses ini."""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    IMPORT_TIMES[module_name] = time.perf_counter() - start
+    return module
+
+
+def measure_cold_import(module_name, python=sys.executable):
+    """Ukur biaya impor dingin (detik) satu modul memakai `python -X importtime` di proses baru."""
+    completed = subprocess.run([python, '-X', 'importtime', '-c', f'import {module_name}'],
+                               capture_output=True, text=True, check=False)
+    if completed.returncode != 0:
+        error_lines = completed.stderr.strip().splitlines()
+        raise ImportError(f"Gagal mengimpor {module_name}: {error_lines[-1] if error_lines else completed.returncode}")
+    cumulative_us = 0
+    for line in completed.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module_name:
+            cumulative_us = int(parts[1].strip())
+    return cumulative_us / 1e6
+
+
+def startup_report(modules=HEAVY_MODULES):
+    report = {}
+    for module_name in modules:
+        try:
+            report[module_name] = round(measure_cold_import(module_name), 4)
+        except ImportError as e:
+            report[module_name] = str(e)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Laporan biaya impor dingin per modul.")
+    parser.add_argument('modules', nargs='*', default=HEAVY_MODULES, help="Modul yang diukur")
+    parser.add_argument('--json', action='store_true', help="Cetak hasil sebagai JSON")
+    args = parser.parse_args(argv)
+
+    report = startup_report(args.modules)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for module_name, cost in sorted(report.items(), key=lambda item: -item[1] if isinstance(item[1], float) else 0):
+            print(f"{module_name:<20} {cost:.3f} s" if isinstance(cost, float) else f"{module_name:<20} {cost}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
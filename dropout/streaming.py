@@ -0,0 +1,189 @@
+"""Mode out-of-core dashboard untuk ekstrak data yang lebih besar dari RAM.
+
+Sumber (CSV `;` atau dataset Parquet terpartisi, mis. `tahun=2023/kampus=A/*.parquet`) dibaca
+per potongan. Setiap potongan langsung diringkas ke `SummaryCube` dan `CoMoments` parsial yang
+kemudian digabung, sehingga KPI, distribusi Status, tab kategorikal dan korelasi seluruh data
+dihitung dari agregat. Kubus dibatasi `STREAMING_MAX_CUBE_CELLS` sel (kolom filter berkardinalitas
+rendah lebih dulu) dan co-moment tidak dikelompokkan per filter; korelasi subset terfilter,
+grafik titik dan tabel mentah memakai sampel reservoir berukuran tetap. Memori yang dipakai
+karenanya tidak bergantung pada jumlah baris maupun jumlah kombinasi filter::
+
+    python -m dropout.streaming data/ekstrak_multi_tahun/
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from dropout.correlation import CoMoments, FrameCorrelation
+from dropout.cube import STATUS_COL, SummaryCube
+from dropout.datastore import DATA_PATH, clean_raw_frame
+from dropout.filters import ALL_OPTION, MAX_FILTER_CARDINALITY, FilterIndex, is_label_column
+from dropout.scoring import sniff_separator
+
+STREAMING_THRESHOLD_BYTES = int(float(os.environ.get('DROPOUT_STREAMING_THRESHOLD_MB', 512)) * 1024 ** 2)
+STREAMING_CHUNK_SIZE = 100_000
+STREAMING_SAMPLE_SIZE = 50_000
+STREAMING_MAX_CUBE_CELLS = 20_000 # batas atas sel kubus (hasil kali kardinalitas kolom kunci x Status)
+
+
+def should_stream(path=DATA_PATH):
+    """Mode out-of-core untuk direktori Parquet, file di atas ambang, atau bila DROPOUT_STREAMING=1."""
+    if os.environ.get('DROPOUT_STREAMING') == '1' or os.path.isdir(path):
+        return True
+    return os.path.exists(path) and os.path.getsize(path) > STREAMING_THRESHOLD_BYTES
+
+
+def iter_source_frames(path=DATA_PATH, chunk_size=STREAMING_CHUNK_SIZE, columns=None):
+    """Potongan DataFrame bersih dari CSV atau dataset Parquet (file tunggal / direktori terpartisi hive)."""
+    if os.path.isdir(path) or path.endswith('.parquet'):
+        import pyarrow.dataset as ds
+        dataset = ds.dataset(path, format='parquet', partitioning='hive')
+        for batch in dataset.to_batches(columns=columns, batch_size=chunk_size):
+            if batch.num_rows:
+                yield clean_raw_frame(batch.to_pandas())
+        return
+    with open(path, encoding='utf-8-sig') as f:
+        sep = sniff_separator(f.readline()) # data.csv memakai ';', data_mapped.csv memakai ','
+    for chunk in pd.read_csv(path, sep=sep, encoding='utf-8-sig', chunksize=chunk_size, usecols=columns):
+        yield clean_raw_frame(chunk)
+
+
+class ReservoirSample:
+    """Sampel acak seragam berukuran tetap dari aliran potongan (Algorithm R, divektorkan per potongan)."""
+
+    def __init__(self, size=STREAMING_SAMPLE_SIZE, seed=0):
+        self.size = size
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._frame = None
+
+    def update(self, chunk):
+        chunk = chunk.reset_index(drop=True)
+        # Baris ke-t (0-based, global) masuk bila slot acak dari [0, t] jatuh < size
+        row_numbers = self.seen + np.arange(len(chunk))
+        slots = np.where(row_numbers < self.size, row_numbers, self._rng.integers(0, row_numbers + 1))
+        self.seen += len(chunk)
+        keep = slots < self.size
+        if not keep.any():
+            return self
+        slots = slots[keep]
+        # Slot yang ditulis beberapa kali dalam satu potongan: baris terakhir yang menang (seperti versi sekuensial)
+        _, last = np.unique(slots[::-1], return_index=True)
+        chosen = np.flatnonzero(keep)[::-1][last]
+        incoming = chunk.take(chosen).set_index(pd.Index(slots[::-1][last]))
+        if self._frame is None:
+            self._frame = incoming
+        else:
+            self._frame = pd.concat([self._frame.drop(index=incoming.index, errors='ignore'), incoming])
+        return self
+
+    def frame(self):
+        """Sampel sebagai DataFrame (kolom label kembali categorical setelah penggabungan antar potongan)."""
+        if self._frame is None:
+            return pd.DataFrame()
+        frame = self._frame.sort_index().reset_index(drop=True)
+        for col in frame.columns[frame.dtypes == 'object']:
+            frame[col] = frame[col].astype('category')
+        return frame
+
+
+class StreamingFilterIndex(FilterIndex):
+    """Filter sidebar: opsi diambil dari kubus (seluruh data), irisan posisi diterapkan pada sampel."""
+
+    def __init__(self, sample, cube):
+        super().__init__(sample, max_cardinality=np.inf)
+        self.columns = {col: self.columns[col] for col in cube.key_columns if col in self.columns}
+        self._options = {col: sorted(cube.distinct_values(col), key=str) for col in self.columns}
+
+    def options(self, col):
+        return [ALL_OPTION] + self._options[col]
+
+    def positions(self, selections):
+        return super().positions({col: val for col, val in selections.items() if col in self.columns})
+
+
+class StreamingCorrelation:
+    """Korelasi tanpa filter dari co-moment seluruh data; subset terfilter dihitung dari sampel reservoir."""
+
+    def __init__(self, comoments, sample, filter_index):
+        self.comoments = comoments
+        self.columns = comoments.columns
+        self.filter_index = filter_index
+        self._sample_correlation = FrameCorrelation(sample, filter_index, [col for col in self.columns if col in sample.columns])
+
+    def corr(self, selections=None):
+        if self.filter_index.positions(selections or {}) is None:
+            return self.comoments.corr()
+        return self._sample_correlation.corr(selections)
+
+
+def bounded_key_columns(chunk, candidates, max_cells=STREAMING_MAX_CUBE_CELLS):
+    """Kolom kunci kubus (urutan asli) yang hasil kali kardinalitasnya x Status tidak melebihi `max_cells`.
+
+    Kardinalitas diperkirakan dari potongan pertama; kolom berkardinalitas rendah dipilih lebih dulu.
+    """
+    cardinality = {col: max(chunk[col].nunique(dropna=False), 1) for col in candidates}
+    cells = max(chunk[STATUS_COL].nunique(dropna=False), 1) if STATUS_COL in chunk.columns else 1
+    selected = set()
+    for col in sorted(candidates, key=cardinality.get):
+        if cells * cardinality[col] <= max_cells:
+            selected.add(col)
+            cells *= cardinality[col]
+    return [col for col in candidates if col in selected]
+
+
+class StreamingDataset:
+    """Agregat gabungan + sampel reservoir hasil satu kali pemindaian sumber data."""
+
+    def __init__(self, n_rows, cube, comoments, sample):
+        self.n_rows = n_rows
+        self.cube = cube
+        self.sample = sample
+        self.filter_index = StreamingFilterIndex(sample, cube)
+        self.correlation = StreamingCorrelation(comoments, sample, self.filter_index)
+
+    @classmethod
+    def scan(cls, path=DATA_PATH, chunk_size=STREAMING_CHUNK_SIZE, sample_size=STREAMING_SAMPLE_SIZE,
+             max_cardinality=MAX_FILTER_CARDINALITY, max_cube_cells=STREAMING_MAX_CUBE_CELLS):
+        """Pindai sumber sekali; kolom filter & shift korelasi ditetapkan dari potongan pertama."""
+        cubes, comoments, key_columns, numeric_columns = [], None, None, None
+        reservoir = ReservoirSample(sample_size)
+        for chunk in iter_source_frames(path, chunk_size):
+            if key_columns is None:
+                key_columns = bounded_key_columns(chunk, [
+                    col for col in chunk.columns
+                    if col != STATUS_COL and is_label_column(chunk[col]) and chunk[col].nunique() < max_cardinality
+                ], max_cube_cells)
+                numeric_columns = list(chunk.select_dtypes(include=np.number).columns)
+            cubes.append(SummaryCube.from_frame(chunk, key_columns))
+            if len(cubes) > 1:
+                cubes = [SummaryCube.combine(cubes)] # jaga jumlah kubus parsial di memori tetap satu
+            partial = CoMoments.from_frame(chunk, numeric_columns, None if comoments is None else comoments.shift)
+            comoments = partial if comoments is None else comoments.merge(partial)
+            reservoir.update(chunk)
+        if not cubes:
+            raise ValueError(f"Sumber data {path} kosong.")
+        return cls(reservoir.seen, cubes[0], comoments, reservoir.frame())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ringkas dataset besar secara streaming (tanpa memuat seluruh baris).")
+    parser.add_argument('path', nargs='?', default=DATA_PATH, help="CSV (pemisah ;), file Parquet, atau direktori Parquet terpartisi")
+    parser.add_argument('--chunk-size', type=int, default=STREAMING_CHUNK_SIZE)
+    parser.add_argument('--sample-size', type=int, default=STREAMING_SAMPLE_SIZE)
+    args = parser.parse_args(argv)
+
+    dataset = StreamingDataset.scan(args.path, args.chunk_size, args.sample_size)
+    status_counts = dataset.cube.status_counts()
+    print(f"{dataset.n_rows:,} baris, kolom filter: {', '.join(dataset.cube.key_columns) or '-'}")
+    for status, count in status_counts.items():
+        print(f"  {status}: {count:,} ({count / dataset.n_rows:.2%})")
+    print(f"Sampel untuk grafik titik: {len(dataset.sample):,} baris", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
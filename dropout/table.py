@@ -0,0 +1,66 @@
+"""Tabel data mentah berhalaman: pengurutan, pemilihan kolom dan ekspor dilakukan di server.
+
+Hanya baris halaman aktif yang dikirim ke browser, sehingga memori browser dan trafik
+websocket tetap datar berapa pun ukuran data. Ekspor ditulis per potongan baris ke buffer
+memori (tanpa salinan DataFrame terurut utuh), lalu diserahkan ke `st.download_button`.
+"""
+import io
+import math
+
+import numpy as np
+
+PAGE_SIZE_OPTIONS = [25, 50, 100, 250, 500]
+EXPORT_CHUNK_SIZE = 50_000
+
+
+def page_count(n_rows, page_size):
+    return max(1, math.ceil(n_rows / page_size))
+
+
+def sorted_positions(df, sort_col=None, ascending=True):
+    """Urutan posisi baris (stabil, NaN di akhir) untuk kolom pengurutan; None berarti urutan asli."""
+    if sort_col is None:
+        return np.arange(len(df))
+    series = df[sort_col]
+    if series.dtype.name == 'category' and not series.cat.ordered:
+        series = series.astype(object)
+    return series.reset_index(drop=True).sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+
+
+def page_frame(df, positions, page, page_size, columns=None):
+    """Ambil satu halaman (nomor mulai dari 1) sesuai urutan posisi dan kolom yang dipilih."""
+    start = (page - 1) * page_size
+    page_df = df.iloc[positions[start:start + page_size]]
+    return page_df[list(columns)] if columns else page_df
+
+
+def iter_export_chunks(df, positions=None, columns=None, chunk_size=EXPORT_CHUNK_SIZE):
+    positions = np.arange(len(df)) if positions is None else positions
+    for start in range(0, len(positions), chunk_size):
+        chunk = df.iloc[positions[start:start + chunk_size]]
+        yield chunk[list(columns)] if columns else chunk
+
+
+def export_bytes(df, export_format='csv', positions=None, columns=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Tulis seluruh data terfilter ke CSV/Parquet per potongan di buffer memori dan kembalikan isi filenya."""
+    buffer = io.BytesIO()
+    if export_format == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        for chunk in iter_export_chunks(df, positions, columns, chunk_size):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(buffer, table.schema)
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+        return buffer.getvalue()
+
+    text_buffer = io.TextIOWrapper(buffer, encoding='utf-8', newline='', write_through=True)
+    for i, chunk in enumerate(iter_export_chunks(df, positions, columns, chunk_size)):
+        chunk.to_csv(text_buffer, index=False, header=(i == 0))
+    text_buffer.flush()
+    data = buffer.getvalue()
+    text_buffer.detach()
+    return data
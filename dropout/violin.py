@@ -0,0 +1,95 @@
+"""Violin plot untuk data besar: ringkasan KDE/kuantil dihitung di server dengan NumPy.
+
+Alih-alih mengirim setiap baris (dan semua kolom sebagai hover) ke browser, hanya kurva
+densitas per Status, statistik box, dan sampel titik terbatas (terstratifikasi per Status)
+yang dimasukkan ke JSON Plotly. Mode ini aktif otomatis di atas `VIOLIN_LARGE_DATA_THRESHOLD`
+baris (dapat diatur lewat variabel lingkungan `DROPOUT_VIOLIN_THRESHOLD`).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+VIOLIN_LARGE_DATA_THRESHOLD = int(os.environ.get('DROPOUT_VIOLIN_THRESHOLD', 20_000))
+VIOLIN_SAMPLE_SIZE = 2_000
+KDE_GRID_SIZE = 200
+_KDE_BINS = 2_048
+
+
+def is_large(df, threshold=None):
+    return len(df) > (VIOLIN_LARGE_DATA_THRESHOLD if threshold is None else threshold)
+
+
+def kde_summary(values, grid_size=KDE_GRID_SIZE):
+    """Densitas KDE Gaussian (bandwidth Scott) via histogram + konvolusi, plus statistik box."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return None
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    lower_fence = values[values >= q1 - 1.5 * iqr].min()
+    upper_fence = values[values <= q3 + 1.5 * iqr].max()
+    stats = {'q1': q1, 'median': median, 'q3': q3, 'lowerfence': lower_fence, 'upperfence': upper_fence, 'n': values.size}
+
+    std = values.std(ddof=1) if values.size > 1 else 0.0
+    bandwidth = 1.06 * min(std, iqr / 1.34 if iqr > 0 else std) * values.size ** (-1 / 5)
+    low, high = values.min(), values.max()
+    if bandwidth <= 0 or high <= low:
+        return {**stats, 'grid': np.array([low]), 'density': np.array([1.0])}
+
+    low, high = low - 3 * bandwidth, high + 3 * bandwidth
+    counts, edges = np.histogram(values, bins=_KDE_BINS, range=(low, high))
+    bin_width = edges[1] - edges[0]
+    kernel_half_width = int(np.ceil(4 * bandwidth / bin_width))
+    offsets = np.arange(-kernel_half_width, kernel_half_width + 1) * bin_width
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    smoothed = np.convolve(counts, kernel / kernel.sum(), mode='same') / (values.size * bin_width)
+    centers = (edges[:-1] + edges[1:]) / 2
+    grid = np.linspace(low, high, grid_size)
+    return {**stats, 'grid': grid, 'density': np.interp(grid, centers, smoothed)}
+
+
+def stratified_sample(df, group_col, n=VIOLIN_SAMPLE_SIZE, random_state=42):
+    """Ambil paling banyak n baris, proporsional per grup (minimal 1 baris per grup)."""
+    if len(df) <= n:
+        return df
+    fractions = n / len(df)
+    parts = []
+    for _, group in df.groupby(group_col, observed=True, sort=False):
+        parts.append(group.sample(n=max(1, int(round(len(group) * fractions))), random_state=random_state))
+    return pd.concat(parts)
+
+
+def build_large_violin_figure(df, value_col, group_col='Status', colors=None, title=None,
+                              sample_size=VIOLIN_SAMPLE_SIZE, random_state=42):
+    import plotly.graph_objects as go
+
+    colors = colors or ['#636EFA']
+    groups = [group for group in pd.unique(df[group_col].dropna())]
+    sample = stratified_sample(df[[group_col, value_col]], group_col, n=sample_size, random_state=random_state)
+    rng = np.random.default_rng(random_state)
+    fig = go.Figure()
+    for i, group in enumerate(groups):
+        color = colors[i % len(colors)]
+        summary = kde_summary(df.loc[df[group_col] == group, value_col])
+        if summary is None:
+            continue
+        half_width = 0.4 * summary['density'] / summary['density'].max()
+        fig.add_trace(go.Scatter(x=np.concatenate([i - half_width, (i + half_width)[::-1]]),
+                                 y=np.concatenate([summary['grid'], summary['grid'][::-1]]),
+                                 fill='toself', mode='lines', line=dict(color=color, width=1), opacity=0.6,
+                                 name=str(group), legendgroup=str(group), hoverinfo='skip'))
+        fig.add_trace(go.Box(x=[i], q1=[summary['q1']], median=[summary['median']], q3=[summary['q3']],
+                             lowerfence=[summary['lowerfence']], upperfence=[summary['upperfence']],
+                             width=0.12, marker_color=color, line_color=color, fillcolor='rgba(255,255,255,0.6)',
+                             name=str(group), legendgroup=str(group), showlegend=False, hoverinfo='y'))
+        group_points = sample.loc[sample[group_col] == group, value_col].to_numpy()
+        fig.add_trace(go.Scattergl(x=i + 0.45 + rng.uniform(0, 0.08, group_points.size), y=group_points,
+                                   mode='markers', marker=dict(color=color, size=3, opacity=0.5),
+                                   name=str(group), legendgroup=str(group), showlegend=False,
+                                   hovertemplate=f"{group_col}={group}<br>{value_col}=%{{y}}<extra></extra>"))
+    fig.update_layout(title=title, xaxis=dict(tickmode='array', tickvals=list(range(len(groups))),
+                                              ticktext=[str(group) for group in groups], title=group_col),
+                      yaxis_title=value_col, legend_title_text=group_col)
+    return fig
@@ -0,0 +1,69 @@
+"""Sketsa drift yang dapat digabung dan tidak adanya peringatan semu pada sampel data latih."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dropout.drift import (MIN_ROWS_FOR_DISTRIBUTION, PSI_WARNING, CategorySketch, DriftMonitor, DriftReference,
+                           HistogramSketch, drift_alerts)
+from dropout.scoring import add_derived_features, normalize_column_names
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_histogram_merge_equals_single_pass():
+    rng = np.random.default_rng(0)
+    reference = HistogramSketch.from_reference(rng.normal(size=5_000))
+    first, second = rng.normal(size=300), rng.normal(size=700)
+    merged = reference.empty_like().update(first).merge(reference.empty_like().update(second))
+    single = reference.empty_like().update(np.concatenate([first, second]))
+    assert np.array_equal(merged.counts, single.counts)
+    assert (merged.low, merged.high, merged.n) == (single.low, single.high, 1_000)
+
+
+def test_category_merge_equals_single_pass():
+    merged = CategorySketch().update([1, 2, 2, np.nan]).merge(CategorySketch().update([2, 3]))
+    assert merged.counts == {1.0: 1, 2.0: 3, 3.0: 1}
+    assert merged.n_missing == 1
+
+
+def test_compare_separates_same_and_shifted_distributions():
+    rng = np.random.default_rng(1)
+    reference = HistogramSketch.from_reference(rng.normal(size=10_000))
+    same = reference.compare(reference.empty_like().update(rng.normal(size=MIN_ROWS_FOR_DISTRIBUTION)))
+    shifted = reference.compare(reference.empty_like().update(rng.normal(1.0, size=MIN_ROWS_FOR_DISTRIBUTION)))
+    assert same['PSI'] < PSI_WARNING and shifted['PSI'] > PSI_WARNING
+    assert shifted['KS'] > same['KS']
+
+
+def test_unseen_categories_are_reported():
+    reference = CategorySketch().update([0] * 50 + [1] * 50)
+    stats = reference.compare(CategorySketch().update([0, 1, 7, 7]))
+    assert stats['Porsi di luar referensi'] == 0.5
+
+
+@pytest.fixture(scope='module')
+def training_rows():
+    raw = pd.read_csv(os.path.join(ROOT, 'data', 'data.csv'), sep=';')
+    raw.columns = normalize_column_names(raw.columns)
+    return add_derived_features(raw.drop(columns=['Status']))
+
+
+@pytest.fixture(scope='module')
+def reference():
+    return DriftReference.from_training(*(os.path.join(ROOT, 'data', name) for name in ('X_train.csv', 'X_test.csv', 'data.csv')))
+
+
+@pytest.mark.parametrize('n_rows', [MIN_ROWS_FOR_DISTRIBUTION, 10 * MIN_ROWS_FOR_DISTRIBUTION // 2])
+def test_no_alert_on_in_distribution_sample(reference, training_rows, n_rows):
+    for seed in range(5):
+        report = DriftMonitor(reference).observe(training_rows.sample(n_rows, random_state=seed))
+        assert drift_alerts(report) == []
+
+
+def test_alert_on_shifted_sample(reference, training_rows):
+    sample = training_rows.sample(MIN_ROWS_FOR_DISTRIBUTION, random_state=0).copy()
+    sample['Admission_grade'] += 15
+    alerts = drift_alerts(DriftMonitor(reference).observe(sample))
+    assert [alert for alert in alerts if alert.startswith('Admission_grade')]
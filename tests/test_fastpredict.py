@@ -0,0 +1,67 @@
+"""Paritas engine inferensi native dengan `predict_proba` model LightGBM pada data/X_test.csv."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('lightgbm')
+pytest.importorskip('joblib')
+
+from dropout.fastpredict import FastInferenceEngine, UnsupportedModelError, build_inference_engine, check_parity
+from dropout.scoring import MODEL_PATH_JOBLIB, load_model
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+X_TEST_PATH = os.path.join(ROOT, 'data', 'X_test.csv')
+ATOL = 1e-9
+
+
+@pytest.fixture(scope='module')
+def model():
+    return load_model(os.path.join(ROOT, MODEL_PATH_JOBLIB))
+
+
+@pytest.fixture(scope='module')
+def X_test(model):
+    return pd.read_csv(X_TEST_PATH)[list(model.feature_names_in_)]
+
+
+@pytest.mark.parametrize('with_booster', [True, False], ids=['booster', 'arrays'])
+def test_native_engine_matches_predict_proba(model, X_test, with_booster):
+    engine = FastInferenceEngine.from_model(model)
+    engine = engine if with_booster else engine.without_booster()
+    expected = model.predict_proba(X_test)
+    proba = engine.predict_proba(X_test)
+    assert np.abs(proba - expected).max() < ATOL
+    assert np.array_equal(proba.argmax(axis=1), expected.argmax(axis=1))
+
+
+def test_check_parity_passes_on_test_split(model, X_test):
+    assert check_parity(model, X_test, atol=ATOL) < ATOL
+
+
+def _fit_classifier(n_classes, **params):
+    import lightgbm as lgb
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((300, 4)), columns=[f'f{i}' for i in range(4)])
+    y = np.minimum((X['f0'] * n_classes).astype(int), n_classes - 1)
+    return lgb.LGBMClassifier(n_estimators=10, verbose=-1, **params).fit(X, y), X
+
+
+@pytest.mark.parametrize('n_classes, params', [
+    (3, {'objective': 'multiclassova'}),
+    (2, {'objective': 'binary', 'sigmoid': 2.0}),
+    (2, {'boosting_type': 'rf', 'bagging_freq': 1, 'bagging_fraction': 0.5}),
+], ids=['multiclassova', 'binary_sigmoid2', 'rf'])
+def test_unsupported_objectives_fall_back_to_model(n_classes, params):
+    model, _ = _fit_classifier(n_classes, **params)
+    with pytest.raises(UnsupportedModelError):
+        FastInferenceEngine.from_model(model)
+    assert build_inference_engine(model) is model
+
+
+@pytest.mark.parametrize('n_classes', [2, 3], ids=['binary', 'multiclass'])
+def test_supported_objectives_match_predict_proba(n_classes):
+    model, X = _fit_classifier(n_classes)
+    engine = FastInferenceEngine.from_model(model).without_booster()
+    assert np.abs(engine.predict_proba(X) - model.predict_proba(X)).max() < ATOL
@@ -0,0 +1,71 @@
+"""Persiapan fitur skoring dan penulisan hasil batch per potongan (CSV/Parquet)."""
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dropout.schema import SchemaError
+from dropout.scoring import DERIVED_FEATURES, NonNumericFeaturesError, ResultWriter, derived_frame, model_features
+
+
+def test_chunked_parquet_output_keeps_first_schema(tmp_path):
+    pytest.importorskip('pyarrow')
+    output = tmp_path / 'hasil.parquet'
+    chunks = [
+        pd.DataFrame({'Marital_status': [1, 2], 'GDP': [1.74, 0.79], 'prediksi_label': ['Dropout', 'Graduate/Enrolled']}),
+        pd.DataFrame({'Marital_status': [np.nan, 1], 'GDP': [np.nan, -0.92], 'prediksi_label': ['Dropout', 'Dropout']}),
+    ]
+    with ResultWriter(str(output), 'parquet') as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+
+    result = pd.read_parquet(output)
+    assert len(result) == 4
+    assert result['Marital_status'].isna().sum() == 1
+    assert result['GDP'].isna().sum() == 1
+    assert result['prediksi_label'].tolist() == ['Dropout', 'Graduate/Enrolled', 'Dropout', 'Dropout']
+
+
+def test_chunked_csv_output_writes_header_once(tmp_path):
+    output = tmp_path / 'hasil.csv'
+    with ResultWriter(str(output), 'csv') as writer:
+        writer.write(pd.DataFrame({'a': [1, 2]}))
+        writer.write(pd.DataFrame({'a': [3]}))
+    assert pd.read_csv(output)['a'].tolist() == [1, 2, 3]
+
+
+def _raw_batch(course):
+    return pd.DataFrame({
+        'Course': course,
+        'Curricular_units_1st_sem_enrolled': [6, 0],
+        'Curricular_units_2nd_sem_enrolled': [6, 5],
+        'Curricular_units_1st_sem_approved': [5, 0],
+        'Curricular_units_2nd_sem_approved': [6, 4],
+        'Curricular_units_1st_sem_grade': [13.0, 0.0],
+        'Curricular_units_2nd_sem_grade': [12.5, 11.0],
+    })
+
+
+def test_derived_frame_keeps_input_columns_for_drift():
+    frame = derived_frame(_raw_batch([9500, 171]))
+    assert set(DERIVED_FEATURES) <= set(frame.columns)
+    assert 'Curricular_units_1st_sem_grade' in frame.columns
+    model = SimpleNamespace(feature_names_in_=np.array(['Course', 'pass_ratio_sem1', 'average_grade']))
+    assert model_features(frame, model).columns.tolist() == ['Course', 'pass_ratio_sem1', 'average_grade']
+
+
+def test_model_features_rejects_text_labels():
+    frame = derived_frame(_raw_batch(['Nursing', 'Animation and Multimedia Design']))
+    model = SimpleNamespace(feature_names_in_=np.array(['Course', 'pass_ratio_sem1']))
+    with pytest.raises(NonNumericFeaturesError) as excinfo:
+        model_features(frame, model)
+    assert excinfo.value.columns == ['Course']
+
+
+def test_strict_schema_rejects_out_of_range_codes():
+    batch = _raw_batch([9500, 171]).assign(Age_at_enrollment=[19, 300])
+    assert derived_frame(batch)['Age_at_enrollment'].tolist() == [19, 300]
+    with pytest.raises(SchemaError) as excinfo:
+        derived_frame(batch, strict=True)
+    assert excinfo.value.issues == ['Age_at_enrollment: di luar rentang int8 [-128, 127]']